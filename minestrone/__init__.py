@@ -1,104 +1,485 @@
 """minestrone - Search, modify, and parse messy HTML with ease."""
 
+import copy
+import os
 import re
-from typing import Iterator, List, Optional, Union
-
-from selectolax.lexbor import LexborHTMLParser
-
-from minestrone.element import Content, Element, Text
-
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+from minestrone.element import (
+    Content,
+    Element,
+    SupportsWrite,
+    Text,
+    _repair_copy,
+    _replace_node,
+)
+from minestrone.element.prettifier import iter_prettify_element
+from minestrone.element.serializer import iter_node_html
+from minestrone.element.walker import Walker
+from minestrone.element_set import ElementSet
+from minestrone.encoding import (
+    DEFAULT_ENCODING,
+    get_fallback_encoding,
+    is_utf8,
+    is_valid_utf8,
+    sniff_encoding,
+)
+from minestrone.index import Index
+from minestrone.selector import Selector, compile, select_many
+
+# `compile` is left out so that `import *` does not shadow the builtin
 __all__ = [
     "HTML",
     "Content",
     "Element",
+    "ElementSet",
+    "Index",
+    "NodeView",
+    "Rewriter",
+    "Selector",
+    "Template",
     "Text",
+    "Walker",
+    "visit",
 ]
 
 
+# The name to use with `query_values` to get the text of an element
+TEXT_VALUE = "#text"
+
+# Whitespace and comments, then the start of a full document; comments end at the first
+# `-->` (even if it overlaps with `<!--`) so that there is never any backtracking
+DOCUMENT_START_PATTERN = (
+    r"\s*(?:<!(?=--)(?:[^-]|-(?!->))*-->\s*)*<(html|body|!DOCTYPE)(?=(\s|>))"
+)
+
+DOCUMENT_START_REGEX = re.compile(DOCUMENT_START_PATTERN, re.IGNORECASE)
+DOCUMENT_START_BYTES_REGEX = re.compile(DOCUMENT_START_PATTERN.encode(), re.IGNORECASE)
+
+
+def _parse(html: Union[str, bytes]) -> LexborHTMLParser:
+    parser = LexborHTMLParser(html)
+
+    # `selectolax` keeps a reference to the encoded HTML which is never used again
+    parser.raw_html = b""
+
+    return parser
+
+
+def _clone(parser: LexborHTMLParser) -> LexborHTMLParser:
+    """Copy the whole document of the parser without serializing it."""
+    clone = parser.clone()
+    root = parser.root
+
+    if root is None or clone.root is None:
+        return clone
+
+    _repair_copy(root, clone.root)
+
+    if root.parent is None:
+        return clone
+
+    # Cloning only copies the `html` node, so copy the doctype and comments around it;
+    # inserting nodes from another document imports a copy of them
+    curr = root.parent.child
+
+    while curr is not None and curr.mem_id != root.mem_id:
+        clone.root.insert_before(curr)
+        curr = curr.next
+
+    curr = root.parent.last_child
+
+    while curr is not None and curr.mem_id != root.mem_id:
+        clone.root.insert_after(curr)
+        curr = curr.prev
+
+    return clone
+
+
 class HTML:
     encoding: Optional[str] = "utf-8"
     _input_is_fragment: bool = False
-    html: str
-    _parser: LexborHTMLParser
+    # UTF-8 `bytes` are kept as-is so they can be parsed without decoding them; `None`
+    # after the source has been released
+    _source: Optional[Union[str, bytes]]
+    _keep_source: bool = True
+    _parsed_html: Optional[LexborHTMLParser] = None
+    _element_cache: Optional[Dict[int, Content]] = None
+    _index: Optional[Index] = None
 
     def __init__(
         self,
         html: Union[str, bytes, "HTML"],
         encoding: Optional[str] = None,
+        cache_elements: bool = False,
+        lazy: bool = False,
+        keep_source: bool = True,
     ) -> None:
-        """Analyze, search, and modify HTML."""
+        """Analyze, search, and modify HTML.
+
+        When `cache_elements` is `True`, the same node always gets the same `Element`
+        instead of a new one every time it is returned.
+
+        When `lazy` is `True`, the HTML is not parsed until the DOM is needed.
+
+        When `keep_source` is `False`, the original HTML is released as soon as it is
+        parsed and `html` gets serialized from the DOM instead.
+        """
 
         if isinstance(html, HTML):
-            self.html = html.html
-            self._parser = LexborHTMLParser(self.html)
             self._input_is_fragment = html._input_is_fragment
-        elif isinstance(html, (str, bytes)):
-            if isinstance(html, bytes):
-                if encoding:
-                    html = html.decode(encoding)
-                else:
-                    html = html.decode("utf-8")  # Default fallback
+            self.encoding = html.encoding
+            cache_elements = cache_elements or html._element_cache is not None
 
-            self.html = html
-            self._parser = LexborHTMLParser(html)
+            if html._source is None:
+                self._source = None
+                self._parsed_html = _clone(html._parser)
+            else:
+                self._source = html._source
+                lazy = lazy or html._parsed_html is None
+        elif isinstance(html, bytes):
+            declared_encoding = encoding
+            (encoding, bom_length) = sniff_encoding(html, encoding)
+            source = html[bom_length:] if bom_length else html
+
+            if is_utf8(encoding) and is_valid_utf8(source):
+                # `selectolax` parses UTF-8 `bytes` directly
+                self._source = source
+            else:
+                if is_utf8(encoding):
+                    # `selectolax` would fail later on invalid UTF-8, so decode it now
+                    encoding = get_fallback_encoding(html, declared_encoding)
 
+                self._source = source.decode(encoding, errors="replace")
+
+            self._input_is_fragment = self._is_fragment(self._source)
+        elif isinstance(html, str):
+            self._source = html
             self._input_is_fragment = self._is_fragment(html)
         else:
             raise Exception("Unknown type to initialize HTML")
 
+        self._keep_source = keep_source
+
+        if not lazy:
+            self._parser  # noqa: B018
+
         if encoding:
             self.encoding = encoding
 
-    def query(self, selector: str) -> Iterator[Element]:
-        """Return an iterator of `Element`s that match the CSS selector."""
-        for node in self._parser.css(selector):
-            yield Element(node)
+        if cache_elements:
+            self._element_cache = {}
+
+    @property
+    def _parser(self) -> LexborHTMLParser:
+        """The parsed HTML; parses the HTML the first time it is needed."""
+        if self._parsed_html is None:
+            if self._source is None:
+                raise Exception("HTML has no source to parse")
+
+            self._parsed_html = _parse(self._source)
+
+            if not self._keep_source:
+                self._source = None
+
+        return self._parsed_html
+
+    def clone(self) -> "HTML":
+        """Copy the HTML, including any changes, without parsing it again.
+
+        The copy has no source, so its `html` is serialized from its DOM.
+        """
+        html = copy.copy(self)
+
+        if self._parsed_html is not None:
+            html._source = None
+            html._parsed_html = _clone(self._parsed_html)
+
+        if self._element_cache is not None:
+            html._element_cache = {}
+
+        html._index = None
+
+        return html
+
+    @classmethod
+    def from_path(
+        cls,
+        path: Union[str, os.PathLike],
+        encoding: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "HTML":
+        """Parse the HTML in a file; see `from_file`."""
+        with open(path, "rb") as fp:
+            return cls.from_file(fp, encoding=encoding, **kwargs)
+
+    @classmethod
+    def from_file(
+        cls,
+        fp: IO,
+        encoding: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "HTML":
+        """Parse the HTML in a file-like object.
+
+        Binary files are parsed as `bytes` so UTF-8 never gets decoded. `keep_source`
+        defaults to `False`, so only the parsed tree is kept in memory.
+        """
+        source = fp.read()
+
+        kwargs.setdefault("keep_source", False)
+
+        return cls(source, encoding=encoding, **kwargs)
+
+    @property
+    def html(self) -> str:
+        """The original HTML that was parsed.
+
+        If the source was released, this is the HTML serialized from the parsed tree.
+        """
+        if self._source is None:
+            return str(self)
+
+        if isinstance(self._source, bytes):
+            return self._source.decode("utf-8", errors="replace")
+
+        return self._source
+
+    @html.setter
+    def html(self, value: str) -> None:
+        self._source = value
+
+    @property
+    def is_parsed(self) -> bool:
+        """Whether the HTML has been parsed yet."""
+        return self._parsed_html is not None
+
+    def _element(self, node: LexborNode) -> Element:
+        return Element._from_node(node, self._element_cache)
+
+    def index(self) -> Index:
+        """Return an `Index` to look up `Element`s by id, tag, or class.
+
+        The index is built the first time it is used, and built again after the
+        document has been changed.
+        """
+        if self._index is None:
+            self._index = Index(self)
+
+        return self._index
+
+    def query(
+        self, selector: Union[str, Selector], limit: Optional[int] = None
+    ) -> Iterator[Element]:
+        """Return an iterator of `Element`s that match the CSS selector.
+
+        When `limit` is passed in, at most that many `Element`s are returned; a `limit`
+        of 1 stops searching at the first match.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("Limit cannot be negative")
+
+        return self._query(selector, limit)
+
+    def _query(
+        self, selector: Union[str, Selector], limit: Optional[int]
+    ) -> Iterator[Element]:
+        if limit == 0:
+            return
+
+        if limit == 1:
+            element = self.query_first(selector)
+
+            if element is not None:
+                yield element
+
+            return
+
+        nodes = compile(selector)._select(self._parser)
+
+        # Only wrap the nodes that will be returned
+        for node in nodes if limit is None else nodes[:limit]:
+            yield self._element(node)
+
+    def query_first(self, selector: Union[str, Selector]) -> Optional[Element]:
+        """Return the first `Element` that matches the CSS selector, or `None`.
+
+        Searching stops at the first match.
+        """
+        node = compile(selector)._select_first(self._parser)
+
+        if node is None:
+            return None
+
+        return self._element(node)
+
+    def exists(self, selector: Union[str, Selector]) -> bool:
+        """Whether any element matches the CSS selector; searching stops at the first match."""
+        return compile(selector)._exists(self._parser)
+
+    def count(self, selector: Union[str, Selector]) -> int:
+        """Return the number of elements that match the CSS selector without creating `Element`s for them."""
+        return len(compile(selector)._select(self._parser))
 
-    def query_to_list(self, selector: str) -> List[Element]:
+    def select(self, selector: Union[str, Selector]) -> ElementSet:
+        """Return an `ElementSet` of the `Element`s that match the CSS selector."""
+        return ElementSet(compile(selector)._select(self._parser), self._element_cache)
+
+    def query_many(
+        self, selectors: Mapping[str, Union[str, Selector]]
+    ) -> Dict[str, ElementSet]:
+        """Return an `ElementSet` for each named CSS selector.
+
+        All of the selectors that are only a tag name are matched in one pass through
+        the HTML, and selectors that are the same are only matched once.
+        """
+        compiled = {name: compile(selector) for name, selector in selectors.items()}
+
+        return {
+            name: ElementSet(nodes, self._element_cache)
+            for name, nodes in select_many(self._parser, compiled).items()
+        }
+
+    def query_to_list(self, selector: Union[str, Selector]) -> List[Element]:
         """Return a list of `Element`s that match the CSS selector."""
         return list(self.query(selector))
 
+    def query_attr(
+        self, selector: Union[str, Selector], name: str
+    ) -> List[Optional[str]]:
+        """Return the value of the attribute for each element that matches the CSS selector.
+
+        Elements without the attribute get `None`. No `Element`s are created.
+        """
+        return [
+            node.attrs.get(name) for node in compile(selector)._select(self._parser)
+        ]
+
+    def query_text(
+        self, selector: Union[str, Selector], strip: bool = False
+    ) -> List[str]:
+        """Return the text of each element that matches the CSS selector without creating `Element`s."""
+        return [
+            node.text(strip=strip) for node in compile(selector)._select(self._parser)
+        ]
+
+    def query_values(
+        self, selector: Union[str, Selector], names: Iterable[str], strip: bool = False
+    ) -> List[Tuple[Optional[str], ...]]:
+        """Return a tuple of values for each element that matches the CSS selector.
+
+        Each name is an attribute, or `#text` for the text of the element. Missing
+        attributes are `None`. No `Element`s are created.
+        """
+        names = tuple(names)
+        values = []
+
+        for node in compile(selector)._select(self._parser):
+            attrs = node.attrs
+            values.append(
+                tuple(
+                    [
+                        node.text(strip=strip)
+                        if name == TEXT_VALUE
+                        else attrs.get(name)
+                        for name in names
+                    ]
+                )
+            )
+
+        return values
+
+    def query_attribute_prefix(
+        self, prefix: Union[str, Tuple[str, ...]]
+    ) -> Iterator[Tuple[Element, str, Optional[str]]]:
+        """Return an iterator of `(element, name, value)` for each attribute name that starts with the prefix.
+
+        A tuple of prefixes can be passed to match any of them in the same pass.
+        """
+        if not self._parser.root:
+            return
+
+        for node in self._parser.root.traverse():
+            if not node.is_element_node:
+                continue
+
+            attrs = node.attrs
+            element = None
+
+            for name in attrs:
+                if name.startswith(prefix):
+                    element = element or self._element(node)
+                    yield (element, name, attrs[name])
+
+    def replace_subtree(
+        self, target: Union[str, Selector, Element], source: Element
+    ) -> List[Element]:
+        """Replace the target `Element` (or every `Element` that matches the CSS selector) with a copy of the source.
+
+        The source can be from any `HTML`; it is copied node by node instead of being
+        serialized and parsed again. Returns the new `Element`s.
+        """
+        if isinstance(target, Element):
+            nodes = [target._node]
+        else:
+            nodes = compile(target)._select(self._parser)
+
+        elements = []
+
+        for node in nodes:
+            inserted = _replace_node(node, source._node)
+
+            if inserted is not None:
+                inserted = _repair_copy(source._node, inserted)
+                elements.append(self._element(inserted))
+
+        return elements
+
     def prettify(
         self,
         indent: int = 2,
         max_line_length: Optional[int] = 88,
     ) -> str:
         """Prettify HTML."""
-        strings = []
+        return "".join(self.iter_pretty(indent, max_line_length))
 
+    def iter_pretty(
+        self,
+        indent: int = 2,
+        max_line_length: Optional[int] = 88,
+    ) -> Iterator[str]:
+        """Yield the prettified HTML in chunks instead of building the whole string."""
         if self._input_is_fragment:
             # Iterate head and body children
-            if self._parser.head:
-                curr = self._parser.head.child
-
-                while curr:
-                    if curr.is_element_node:
-                        element = Element(curr)
-                        strings.append(element.prettify(indent, max_line_length))
-                    elif curr.is_text_node:
-                        text_content = curr.text_content
-                        text = text_content.strip() if text_content else ""
-                        if text:
-                            strings.append(f"{text}\n")
-                    elif curr.is_comment_node:
-                        strings.append(f"<!-- {curr.comment_content} -->\n")
-
-                    curr = curr.next
-
-            if self._parser.body:
-                curr = self._parser.body.child
+            for parent in self._head_and_body():
+                curr = parent.child
 
                 while curr:
                     if curr.is_element_node:
-                        element = Element(curr)
-                        strings.append(element.prettify(indent, max_line_length))
+                        yield from iter_prettify_element(
+                            Element(curr), indent, max_line_length
+                        )
                     elif curr.is_text_node:
                         text_content = curr.text_content
                         text = text_content.strip() if text_content else ""
                         if text:
-                            strings.append(f"{text}\n")
+                            yield f"{text}\n"
                     elif curr.is_comment_node:
-                        strings.append(f"<!-- {curr.comment_content} -->\n")
+                        yield f"<!-- {curr.comment_content} -->\n"
 
                     curr = curr.next
         else:
@@ -109,35 +490,36 @@ class HTML:
 
             while curr:
                 if curr.tag == "-doctype":
-                    strings.append("<!DOCTYPE html>\n")
+                    yield "<!DOCTYPE html>\n"
                 elif curr.tag == "html":
-                    element = Element(curr)
-                    strings.append(element.prettify(indent, max_line_length))
+                    yield from iter_prettify_element(
+                        Element(curr), indent, max_line_length
+                    )
                 elif curr.is_comment_node:
-                    strings.append(f"<!-- {curr.comment_content} -->\n")
+                    yield f"<!-- {curr.comment_content} -->\n"
 
                 curr = curr.next
 
-        return "".join(strings)
+    def write_pretty(
+        self,
+        fp: SupportsWrite,
+        indent: int = 2,
+        max_line_length: Optional[int] = 88,
+    ) -> None:
+        """Write the prettified HTML to a file-like object as it is generated."""
+        for chunk in self.iter_pretty(indent, max_line_length):
+            fp.write(chunk)
 
     @property
     def root_element(self) -> Optional[Element]:
         """Gets the root `Element` for the HTML."""
         if self._input_is_fragment:
-            # Check head first (e.g. link, meta tags)
-            if self._parser.head:
-                curr = self._parser.head.child
+            # Check head first (e.g. link, meta tags), then body
+            for parent in self._head_and_body():
+                curr = parent.child
                 while curr:
                     if curr.is_element_node:
-                        return Element(curr)
-                    curr = curr.next
-
-            # Check body
-            if self._parser.body:
-                curr = self._parser.body.child
-                while curr:
-                    if curr.is_element_node:
-                        return Element(curr)
+                        return self._element(curr)
                     curr = curr.next
 
             return None
@@ -145,7 +527,18 @@ class HTML:
         if not self._parser.root:
             return None
 
-        return Element(self._parser.root)
+        return self._element(self._parser.root)
+
+    def walk(self) -> Walker:
+        """Return a `Walker` over all of the `Element`s and `Text` in document order.
+
+        The walk is lazy; call `skip` on the `Walker` to not walk the children of an
+        element, or stop iterating to end the walk.
+        """
+        # The nodes that a fragment gets wrapped in are not walked, but their children are
+        transparent_tags = ("html", "head", "body") if self._input_is_fragment else ()
+
+        return Walker(self._parser.root, self._element_cache, transparent_tags)
 
     @property
     def elements(self) -> Iterator[Element]:
@@ -154,16 +547,85 @@ class HTML:
             if self._input_is_fragment and node.tag in ("html", "head", "body"):
                 continue
 
-            yield Element(node)
+            yield self._element(node)
 
     def __str__(self) -> str:
+        if self._parsed_html is None:
+            # Nothing could have been changed before the HTML is parsed
+            return self.html
+
         if self._input_is_fragment:
             return self._serialize_fragment()
         return self._parser.html or ""
 
+    def iter_html(self) -> Iterator[str]:
+        """Yield the HTML in chunks instead of building the whole string."""
+        if self._parsed_html is None:
+            yield self.html
+            return
+
+        if self._input_is_fragment:
+            yield from self._iter_fragment(iter_node_html)
+            return
+
+        if self._parser.root and self._parser.root.parent:
+            curr = self._parser.root.parent.child
+        else:
+            curr = None
+
+        while curr:
+            yield from iter_node_html(curr)
+            curr = curr.next
+
+    def to_bytes(self, encoding: Optional[str] = None) -> bytes:
+        """Encode the HTML to `bytes`; defaults to the encoding of the HTML.
+
+        Characters that cannot be encoded are replaced with character references.
+        """
+        encoding = encoding or self.encoding or DEFAULT_ENCODING
+
+        if (
+            self._parsed_html is None
+            and isinstance(self._source, bytes)
+            and is_utf8(encoding)
+        ):
+            return self._source
+
+        return str(self).encode(encoding, errors="xmlcharrefreplace")
+
+    def write_to(self, fp: SupportsWrite) -> None:
+        """Write the HTML to a file-like object as it is generated."""
+        for chunk in self.iter_html():
+            fp.write(chunk)
+
     def _serialize_fragment(self) -> str:
         """Serialize as a fragment, skipping html/head/body wrappers."""
-        output = []
+        return "".join(self._iter_fragment(lambda node: (node.html or "",)))
+
+    def _head_and_body(self) -> List[LexborNode]:
+        """Get the `head` and `body` nodes that a fragment gets parsed into.
+
+        They are looked up from the `html` node because a cloned parser does not set
+        `head` and `body`.
+        """
+        if not self._parser.root:
+            return []
+
+        parents = []
+        curr = self._parser.root.child
+
+        while curr:
+            if curr.tag in ("head", "body"):
+                parents.append(curr)
+
+            curr = curr.next
+
+        return parents
+
+    def _iter_fragment(
+        self, serialize: Callable[[LexborNode], Iterable[str]]
+    ) -> Iterator[str]:
+        """Yield the serialized top-level nodes of a fragment."""
 
         # Traverse Document children
         # If html node -> traverse its children (Head, Body)
@@ -173,50 +635,33 @@ class HTML:
             curr = None
         while curr:
             if curr.tag == "html":
-                # Check head
-                if self._parser.head:
-                    head_child = self._parser.head.child
-                    while head_child:
-                        output.append(head_child.html)
-                        head_child = head_child.next
-
-                # Check body
-                if self._parser.body:
-                    body_child = self._parser.body.child
-                    while body_child:
-                        output.append(body_child.html)
-                        body_child = body_child.next
+                # Check head and body
+                for parent in self._head_and_body():
+                    child = parent.child
+                    while child:
+                        yield from serialize(child)
+                        child = child.next
+            elif curr.is_comment_node:
+                yield f"<!-- {curr.comment_content} -->"
             else:
-                if curr.is_comment_node:
-                    output.append(f"<!-- {curr.comment_content} -->")
-                elif curr.tag == "-doctype":
-                    output.append(curr.html)
-                else:
-                    output.append(curr.html)
+                yield from serialize(curr)
 
             curr = curr.next
 
-        return "".join(output)
-
     def __repr__(self) -> str:
         return self.__str__()
 
     @staticmethod
-    def _is_fragment(html: str) -> bool:
+    def _is_fragment(html: Union[str, bytes]) -> bool:
         """Heuristic to detect if input is a fragment or full document."""
-        # Create a working copy to strip content from to check for start
-        text = html.lstrip()
-
-        # Iteratively strip comments from the start
-        while True:
-            if text.startswith("<!--"):
-                end_idx = text.find("-->")
-                if end_idx != -1:
-                    text = text[end_idx + 3 :].lstrip()
-                    continue
-            break
-
-        if re.match(r"^<(html|body|!DOCTYPE)(?=(\s|>))", text, re.IGNORECASE):
-            return False
-
-        return True
+        if isinstance(html, bytes):
+            return not DOCUMENT_START_BYTES_REGEX.match(html)
+
+        return not DOCUMENT_START_REGEX.match(html)
+
+
+# `Rewriter`, `Template`, and `visit` are built on top of `HTML`, so they can only be
+# imported once `HTML` exists
+from minestrone.rewriter import Rewriter  # noqa: E402
+from minestrone.template import Template  # noqa: E402
+from minestrone.visitor import NodeView, visit  # noqa: E402
@@ -0,0 +1,129 @@
+"""Parse and process many HTML documents across a process pool."""
+
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import (
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from minestrone import HTML
+
+__all__ = [
+    "map_documents",
+]
+
+T = TypeVar("T")
+
+Source = Union[str, bytes, os.PathLike]
+
+DEFAULT_CHUNKSIZE = 16
+
+
+def _read_source(source: Source) -> Union[str, bytes]:
+    """Get the HTML for a source; paths are read as `bytes` inside the worker."""
+    if isinstance(source, os.PathLike):
+        with open(source, "rb") as f:
+            return f.read()
+
+    return source
+
+
+def _process_chunk(
+    func: Callable[[HTML], T],
+    chunk: List[Source],
+    encoding: Optional[str],
+) -> List[T]:
+    """Parse every source in a chunk and call `func` with the resulting `HTML`."""
+    return [func(HTML(_read_source(source), encoding=encoding)) for source in chunk]
+
+
+def _chunks(sources: Iterable[Source], chunksize: int) -> Iterator[List[Source]]:
+    iterator = iter(sources)
+
+    while True:
+        chunk = list(islice(iterator, chunksize))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def map_documents(
+    func: Callable[[HTML], T],
+    sources: Iterable[Source],
+    *,
+    max_workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    ordered: bool = True,
+    encoding: Optional[str] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[T]:
+    """Parse each source into `HTML` in a process pool and yield `func`'s results.
+
+    `sources` can contain `str` or `bytes` of HTML, or `os.PathLike` paths which are
+    read by the worker so the file content never gets pickled. Sources are sent to
+    the workers in chunks of `chunksize` and only a bounded number of chunks are in
+    flight at once, so `sources` can be a lazy iterable of any length.
+
+    `func` must be picklable (i.e. defined at the module level) and so must its
+    return value. When `ordered` is `False`, results are yielded as soon as their
+    chunk completes instead of in the order of `sources`.
+    """
+
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    owns_executor = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+    max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+    chunks = _chunks(sources, chunksize)
+
+    try:
+        if ordered:
+            pending: Deque[Future] = deque()
+
+            for chunk in chunks:
+                pending.append(pool.submit(_process_chunk, func, chunk, encoding))
+
+                if len(pending) >= max_in_flight:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        else:
+            in_flight: Set[Future] = set()
+
+            for chunk in chunks:
+                in_flight.add(pool.submit(_process_chunk, func, chunk, encoding))
+
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        yield from future.result()
+
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    yield from future.result()
+    finally:
+        if owns_executor:
+            pool.shutdown(cancel_futures=True)
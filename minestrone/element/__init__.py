@@ -1,15 +1,405 @@
 """Element and Text classes for minestrone."""
 
-from typing import Dict, Iterator, List, Optional, Union
+import re
+from collections.abc import MutableMapping
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from selectolax.lexbor import LexborHTMLParser, LexborNode
 
+from minestrone.element.serializer import iter_node_html
+from minestrone.selector import Selector, compile
+
+if TYPE_CHECKING:
+    from minestrone.element.walker import Walker
+
+C = TypeVar("C", bound="Content")
+
+# A subtree to build: `(name, attributes, children)` where `attributes` and `children`
+# are optional; children can be text, an `Element`, another spec, or a list of them
+Spec = Union[Tuple[str], Tuple[str, Optional[Dict]], Tuple[str, Optional[Dict], Any]]
+
+# The child index of each node from a root node down to a node
+Path = List[int]
+
+# SVG tags that `selectolax` lowercases when it copies a node; matching is not
+# case-sensitive
+SVG_CAMEL_CASE_TAGS = (
+    "altGlyph",
+    "altGlyphDef",
+    "altGlyphItem",
+    "animateColor",
+    "animateMotion",
+    "animateTransform",
+    "clipPath",
+    "feBlend",
+    "feColorMatrix",
+    "feComponentTransfer",
+    "feComposite",
+    "feConvolveMatrix",
+    "feDiffuseLighting",
+    "feDisplacementMap",
+    "feDistantLight",
+    "feDropShadow",
+    "feFlood",
+    "feFuncA",
+    "feFuncB",
+    "feFuncG",
+    "feFuncR",
+    "feGaussianBlur",
+    "feImage",
+    "feMerge",
+    "feMergeNode",
+    "feMorphology",
+    "feOffset",
+    "fePointLight",
+    "feSpecularLighting",
+    "feSpotLight",
+    "feTile",
+    "feTurbulence",
+    "foreignObject",
+    "glyphRef",
+    "linearGradient",
+    "radialGradient",
+    "textPath",
+)
+
+SVG_CAMEL_CASE_SELECTOR = ", ".join(SVG_CAMEL_CASE_TAGS)
+
+TAG_NAME_REGEX = re.compile(r"^[a-zA-Z][^\s/>\x00]*$")
+
+# Number of nodes to create in a scratch document before starting a new one
+SCRATCH_DOCUMENT_SIZE = 10_000
+
+_scratch_parser: Optional[LexborHTMLParser] = None
+_scratch_parser_size = 0
+
+# Incremented whenever an `Element` changes a document so that indexes know to rebuild
+_generation = 0
+
+
+class SupportsWrite(Protocol):
+    """A file-like object that strings can be written to."""
+
+    def write(self, s: str, /) -> object: ...
+
+
+def _convert_attribute(name: str, value: Any) -> Tuple[str, str]:
+    """Convert an attribute name and value to be compatible with `selectolax`."""
+    if name == "class" or name == "klass" or name == "css":
+        name = "class"
+
+    if isinstance(value, (list, tuple)):
+        value = " ".join(value)
+
+    if value is True:
+        value = name
+
+    if not isinstance(value, (str, bool, list, tuple)):
+        raise ValueError(
+            f"Attribute value must be a string, boolean, list, or tuple, not {type(value)}"
+        )
+
+    return (name, str(value))
+
+
+def _mutated() -> None:
+    global _generation
+
+    _generation += 1
+
+
+def _scratch_document() -> LexborHTMLParser:
+    """Get the document that detached elements get created in.
+
+    Nodes are only freed with their document, so a new document is started after
+    `SCRATCH_DOCUMENT_SIZE` nodes; existing nodes keep their document alive.
+    """
+    global _scratch_parser, _scratch_parser_size
+
+    if _scratch_parser is None or _scratch_parser_size >= SCRATCH_DOCUMENT_SIZE:
+        _scratch_parser = LexborHTMLParser("")
+        _scratch_parser_size = 0
+
+    return _scratch_parser
+
+
+def _create_node(
+    parser: LexborHTMLParser,
+    name: str,
+    text: Optional[str] = None,
+    attributes: Optional[Dict] = None,
+) -> LexborNode:
+    """Create a detached node in the document of the parser."""
+    global _scratch_parser_size
+
+    if not TAG_NAME_REGEX.match(name):
+        raise Exception(f"Could not create element {name}")
+
+    node = parser.create_node(name)
+
+    if parser is _scratch_parser:
+        _scratch_parser_size += 1
+
+    if attributes:
+        attrs = node.attrs
+
+        for k, v in attributes.items():
+            k, v = _convert_attribute(k, v)
+            attrs[k] = v
+
+    if text:
+        node.insert_child(text)
+
+    return node
+
+
+def _create_spec_node(parser: LexborHTMLParser, spec: Spec) -> LexborNode:
+    if not spec or len(spec) > 3:
+        raise ValueError(f"Invalid element spec: {spec!r}")
+
+    return _create_node(parser, spec[0], attributes=spec[1] if len(spec) > 1 else None)
+
+
+def _build_children(parser: LexborHTMLParser, node: LexborNode, children: Any) -> None:
+    if children is None:
+        return
+
+    if isinstance(children, str):
+        if children:
+            node.insert_child(children)
+    elif isinstance(children, tuple):
+        # Inserting a node inserts a copy of it, so insert it while it is still empty
+        # and then build its children into the copy
+        node.insert_child(_create_spec_node(parser, children))
+
+        if len(children) > 2:
+            _build_children(parser, node.last_child, children[2])
+    elif isinstance(children, list):
+        for child in children:
+            _build_children(parser, node, child)
+    elif isinstance(children, Element):
+        node.insert_child(children._node)
+        _repair_copy(children._node, node.last_child)
+    elif isinstance(children, Iterable):
+        for child in children:
+            _build_children(parser, node, child)
+    else:
+        raise ValueError(f"Invalid children: {children!r}")
+
+
+def _build_node(parser: LexborHTMLParser, spec: Spec) -> LexborNode:
+    """Create a detached subtree from the spec in the document of the parser."""
+    node = _create_spec_node(parser, spec)
+
+    if len(spec) > 2:
+        _build_children(parser, node, spec[2])
+
+    return node
+
+
+def _remove_children(node: LexborNode) -> None:
+    """Remove all of the children of the node in one native operation."""
+    _mutated()
+    node.inner_html = ""
+
+
+def _replace_node(
+    node: LexborNode, replacement: Union[str, LexborNode]
+) -> Optional[LexborNode]:
+    """Replace the node, which stays intact but detached.
+
+    Inserting a node from any document inserts a copy of it, so the inserted node is
+    returned.
+    """
+    parent = node.parent
+
+    if parent is None:
+        raise Exception("Element does not have a parent element")
+
+    _mutated()
+    prev = node.prev
+    node.replace_with(replacement)
+
+    return prev.next if prev is not None else parent.child
+
+
+def _detach(node: LexborNode) -> None:
+    """Detach the node without destroying it (which `remove` does)."""
+    placeholder = _replace_node(node, "")
+
+    if placeholder is not None:
+        placeholder.remove()
+
+
+def _get_path(node: LexborNode, root: LexborNode) -> Path:
+    """Get the child index of each node from the root down to the node."""
+    path = []
+
+    while node.mem_id != root.mem_id:
+        index = 0
+        prev = node.prev
+
+        while prev is not None:
+            index += 1
+            prev = prev.prev
+
+        path.append(index)
+
+        if node.parent is None:
+            raise ValueError("Node is not inside of the root")
+
+        node = node.parent
+
+    path.reverse()
+
+    return path
+
+
+def _follow_path(root: LexborNode, path: Path) -> LexborNode:
+    node = root
+
+    for index in path:
+        node = node.child
+
+        for _ in range(index):
+            node = node.next
+
+    return node
+
+
+def _reparse_targets(source: LexborNode) -> List[LexborNode]:
+    """Get the outermost nodes in the source that cannot be copied node by node."""
+    targets: Dict[int, LexborNode] = {}
+
+    for node in source.css("template, svg"):
+        # Only an `svg` with camel-cased tags in it gets broken
+        if node.tag == "svg" and node.css_first(SVG_CAMEL_CASE_SELECTOR) is None:
+            continue
+
+        curr = node.parent if node.mem_id != source.mem_id else None
+
+        # Skip nodes that are inside of another target
+        while curr is not None and curr.mem_id not in targets:
+            curr = None if curr.mem_id == source.mem_id else curr.parent
+
+        if curr is None:
+            targets[node.mem_id] = node
+
+    return list(targets.values())
+
+
+def _repair_copy(source: LexborNode, copy: LexborNode) -> LexborNode:
+    """Fix the parts of a copy of the source that `selectolax` does not copy correctly.
+
+    Cloning or inserting a node leaves the content of `template` elements behind and
+    lowercases camel-cased SVG tags like `clipPath`, so those subtrees are parsed again
+    from the source's HTML. Returns the copy, which is a new node if it was parsed again.
+    """
+    targets = _reparse_targets(source)
+
+    # Find all of the nodes in the copy before any of them get replaced
+    broken = [_follow_path(copy, _get_path(target, source)) for target in targets]
+
+    for target, node in zip(targets, broken):
+        is_copy = node.mem_id == copy.mem_id
+
+        if node.parent is None:
+            fragment = node.parser.create_node("div")
+            fragment.inner_html = target.html or ""
+            parsed = fragment.child
+            _detach(parsed)
+        else:
+            # Parse the HTML where the node is, because inserting a parsed node would
+            # break it again
+            node.insert_before(node.parser.create_node("div"))
+            fragment = node.prev
+            fragment.inner_html = target.html or ""
+            parsed = fragment.child
+            node.decompose()
+            fragment.unwrap()
+
+        if is_copy:
+            copy = parsed
+
+    return copy
+
+
+class Attributes(MutableMapping):
+    """A live view of an element's attributes that reads and writes the node directly."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: LexborNode) -> None:
+        """Initialize Attributes."""
+        self._node = node
+
+    def __getitem__(self, name: str) -> Optional[str]:
+        return self._node.attrs[name]
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        name, value = _convert_attribute(name, value)
+        self._node.attrs[name] = value
+        _mutated()
+
+    def __delitem__(self, name: str) -> None:
+        del self._node.attrs[name]
+        _mutated()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._node.attrs)
+
+    def __len__(self) -> int:
+        return len(self._node.attrs)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name in self._node.attrs
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self._node.attrs.get(name, default)
+
+    def __repr__(self) -> str:
+        return repr(dict(self._node.attrs))
+
 
 class Content:
     """Base class for `Text` and `Element` classes."""
 
+    __slots__ = ("_node", "_cache")
+
     _node: LexborNode
 
+    # Per-document wrappers keyed by the node's `mem_id`; `None` when not caching
+    _cache: Optional[Dict[int, "Content"]]
+
+    @classmethod
+    def _from_node(
+        cls: Type[C], node: LexborNode, cache: Optional[Dict[int, "Content"]]
+    ) -> C:
+        """Wrap the node, re-using the existing wrapper from the cache if there is one."""
+        if cache is None:
+            return cls(node)
+
+        content = cache.get(node.mem_id)
+
+        if not isinstance(content, cls):
+            content = cls(node, cache)
+            cache[node.mem_id] = content
+
+        return content
+
     def _convert_attributes(self, attributes: Dict) -> Dict:
         """Convert attributes to be compatible with `selectolax`."""
         new_attributes: Dict[str, str] = {}
@@ -29,6 +419,8 @@ class Content:
         self, name: Optional[str] = None, text: Optional[str] = None, **kwargs
     ) -> Union["Element", "Text"]:
         """Add `Text` or a new `Element` after the current `Element`."""
+        _mutated()
+
         if name is None:
             if text is None:
                 raise ValueError("Text content is required")
@@ -42,21 +434,23 @@ class Content:
             next_node = self._node.next
 
             if next_node and next_node.is_text_node:
-                return Text(next_node)
+                return Text._from_node(next_node, self._cache)
 
             raise Exception("Could not find inserted text node")
         else:
-            element = Element.create(name, text, **kwargs)
-            self._node.insert_after(element._node)
+            # Create the node in the same document instead of parsing a new one
+            self._node.insert_after(_create_node(self._node.parser, name, text, kwargs))
             inserted = self._node.next
             if not inserted:
                 raise Exception("Could not find inserted element")
-            return Element(inserted)
+            return Element._from_node(inserted, self._cache)
 
     def prepend(
         self, name: Optional[str] = None, text: Optional[str] = None, **kwargs
     ) -> Union["Element", "Text"]:
         """Add a new element before the current element."""
+        _mutated()
+
         if name is None:
             if text is None:
                 raise ValueError("Text content is required")
@@ -66,21 +460,37 @@ class Content:
             self._node.insert_before(text)
             prev_node = self._node.prev
             if prev_node and prev_node.is_text_node:
-                return Text(prev_node)
+                return Text._from_node(prev_node, self._cache)
             raise Exception("Could not find inserted text node")
         else:
-            element = Element.create(name, text, **kwargs)
-            self._node.insert_before(element._node)
+            # Create the node in the same document instead of parsing a new one
+            self._node.insert_before(
+                _create_node(self._node.parser, name, text, kwargs)
+            )
             inserted = self._node.prev
             if not inserted:
                 raise Exception("Could not find inserted element")
-            return Element(inserted)
+            return Element._from_node(inserted, self._cache)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Content) and type(self) is type(other):
+            return self._node.mem_id == other._node.mem_id
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._node.mem_id)
 
 
 class Text(Content):
-    def __init__(self, node: LexborNode):
+    __slots__ = ()
+
+    def __init__(
+        self, node: LexborNode, cache: Optional[Dict[int, Content]] = None
+    ) -> None:
         """Initialize Text."""
         self._node = node
+        self._cache = cache
 
     def __str__(self) -> str:
         return self._node.text_content or ""
@@ -90,9 +500,14 @@ class Text(Content):
 
 
 class Element(Content):
-    def __init__(self, node: LexborNode):
+    __slots__ = ()
+
+    def __init__(
+        self, node: LexborNode, cache: Optional[Dict[int, Content]] = None
+    ) -> None:
         """Initialize Element."""
         self._node = node
+        self._cache = cache
 
     @staticmethod
     def create(
@@ -101,24 +516,32 @@ class Element(Content):
         **kwargs,
     ) -> "Element":
         """Create a detached `Element`."""
-        html = f"<{name}></{name}>"
-        parser = LexborHTMLParser(html)
-
-        if not parser.body or not parser.body.child:
-            raise Exception(f"Could not create element {name}")
-
-        node = parser.body.child
+        return Element(_create_node(_scratch_document(), name, text, kwargs))
 
-        if text:
-            node.insert_child(text)
-
-        element = Element(node)
+    @staticmethod
+    def build(spec: Spec) -> "Element":
+        """Create a detached `Element` with all of its children from a spec.
+
+        A spec is a tuple of `(name, attributes, children)`; `attributes` and `children`
+        are optional. Children can be text, an `Element`, another spec, or a list of
+        them, e.g. `("ul", {"class": "x"}, [("li", None, "a"), ("li", None, "b")])`.
+        """
+        return Element(_build_node(_scratch_document(), spec))
+
+    def clone(self, deep: bool = True) -> "Element":
+        """Create a detached copy of the element in the same document.
+
+        When `deep` is `False`, only the tag and its attributes are copied.
+        """
+        if deep:
+            node = _repair_copy(self._node, self._node.clone())
+        else:
+            node = self._node.parser.create_node(self.name)
 
-        # Apply attributes
-        if kwargs:
-            element.attributes = kwargs
+            for name, value in self._node.attrs.items():
+                node.attrs[name] = value
 
-        return element
+        return Element._from_node(node, self._cache)
 
     @property
     def name(self) -> str:
@@ -134,34 +557,49 @@ class Element(Content):
     def id(self, value: str) -> None:
         """Set the element id."""
         self._node.attrs["id"] = value
+        _mutated()
 
     @property
     def attributes(self) -> Dict:
-        """Get the element attributes."""
+        """Get a copy of the element attributes."""
         return dict(self._node.attrs)
 
     @attributes.setter
     def attributes(self, value: Dict) -> None:
         """Set the element attributes."""
-        for k in list(self._node.attrs.keys()):
-            del self._node.attrs[k]
+        _mutated()
+        attrs = self._node.attrs
+        new_attributes = dict(_convert_attribute(k, v) for k, v in value.items())
 
-        for k, v in value.items():
-            if k == "class" or k == "klass" or k == "css":
-                k = "class"
+        # Only touch the attributes that were removed or changed
+        for k in [k for k in attrs if k not in new_attributes]:
+            del attrs[k]
 
-            if isinstance(v, (list, tuple)):
-                v = " ".join(v)
+        for k, v in new_attributes.items():
+            if attrs.get(k) != v:
+                attrs[k] = v
 
-            if v is True:
-                v = k
+    @property
+    def attrs(self) -> "Attributes":
+        """Get a live view of the element attributes."""
+        return Attributes(self._node)
+
+    def get_attribute(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Get the value of an attribute."""
+        return self._node.attrs.get(name, default)
 
-            if not isinstance(v, (str, bool, list, tuple)):
-                raise ValueError(
-                    f"Attribute value must be a string, boolean, list, or tuple, not {type(v)}"
-                )
+    def has_attribute(self, name: str) -> bool:
+        """Whether the element has the attribute."""
+        return name in self._node.attrs
 
-            self._node.attrs[k] = str(v)
+    def update_attributes(self, attributes: Optional[Dict] = None, **kwargs) -> None:
+        """Add or change attributes without removing any of the existing ones."""
+        _mutated()
+        attrs = self._node.attrs
+
+        for k, v in {**(attributes or {}), **kwargs}.items():
+            k, v = _convert_attribute(k, v)
+            attrs[k] = v
 
     @property
     def classes(self) -> List[str]:
@@ -175,6 +613,7 @@ class Element(Content):
     def classes(self, value: List[str]) -> None:
         """Set the element classes."""
         self._node.attrs["class"] = " ".join(value)
+        _mutated()
 
     @property
     def children(self) -> Iterator["Element"]:
@@ -182,15 +621,51 @@ class Element(Content):
         curr = self._node.child
         while curr:
             if curr.is_element_node:
-                yield Element(curr)
+                yield Element._from_node(curr, self._cache)
             curr = curr.next
 
+    def query(self, selector: Union[str, Selector]) -> Iterator["Element"]:
+        """Return an iterator of the descendant `Element`s that match the CSS selector."""
+        for node in compile(selector)._select_descendants(self._node):
+            yield Element._from_node(node, self._cache)
+
+    def query_first(self, selector: Union[str, Selector]) -> Optional["Element"]:
+        """Return the first descendant `Element` that matches the CSS selector, or `None`."""
+        node = compile(selector)._select_first_descendant(self._node)
+
+        if node is None:
+            return None
+
+        return Element._from_node(node, self._cache)
+
+    def matches(self, selector: Union[str, Selector]) -> bool:
+        """Whether the element matches the CSS selector.
+
+        Unless the selector is only a tag name, this searches the element's subtree.
+        """
+        return compile(selector)._matches(self._node)
+
+    def closest(self, selector: Union[str, Selector]) -> Optional["Element"]:
+        """Return the element or its nearest ancestor that matches the CSS selector, or `None`."""
+        node = compile(selector)._closest(self._node)
+
+        if node is None:
+            return None
+
+        return Element._from_node(node, self._cache)
+
+    def walk(self) -> "Walker":
+        """Return a `Walker` over the element and its descendants in document order."""
+        from minestrone.element.walker import Walker
+
+        return Walker(self._node, self._cache)
+
     @property
     def parent(self) -> Optional["Element"]:
         """Get the parent element."""
         p = self._node.parent
         if p:
-            return Element(p)
+            return Element._from_node(p, self._cache)
         return None
 
     @property
@@ -209,17 +684,79 @@ class Element(Content):
     @text.setter
     def text(self, value: str) -> None:
         """Set the text content."""
-        # Remove all children
-        while self._node.child:
-            self._node.child.remove()
-
+        _remove_children(self._node)
         self._node.insert_child(value)
 
+    @property
+    def inner_html(self) -> str:
+        """Get the HTML of the children."""
+        return self._node.inner_html or ""
+
+    @inner_html.setter
+    def inner_html(self, value: str) -> None:
+        """Replace the children with the parsed HTML."""
+        self._node.inner_html = value
+        _mutated()
+
+    @property
+    def outer_html(self) -> str:
+        """Get the HTML of the element."""
+        return self._node.html or ""
+
+    @outer_html.setter
+    def outer_html(self, value: str) -> None:
+        """Replace the element with the parsed HTML."""
+        parent = self._node.parent
+
+        if parent is None or not parent.is_element_node:
+            raise Exception("Element does not have a parent element")
+
+        # Parse the HTML in the context of the parent (e.g. so `<td>` works in a `<tr>`)
+        # and then splice all of the new nodes in at once
+        fragment = self._node.parser.create_node(parent.tag or "div")
+        fragment.inner_html = value
+
+        inserted = _replace_node(self._node, fragment)
+
+        if inserted is not None:
+            _repair_copy(fragment, inserted).unwrap(delete_empty=True)
+
+    def replace_with(self, value: Union[str, "Element"]) -> None:
+        """Replace the element with HTML or (a copy of) another `Element`."""
+        if isinstance(value, str):
+            self.outer_html = value
+            return
+
+        inserted = _replace_node(self._node, value._node)
+
+        if inserted is not None:
+            _repair_copy(value._node, inserted)
+
+    def adopt(self, other: "Element", move: bool = False) -> "Element":
+        """Append a copy of an `Element` from any document as the last child.
+
+        When `move` is `True`, `other` is also detached from its document. Returns the
+        new `Element` in this document.
+        """
+        _mutated()
+        self._node.insert_child(other._node)
+        inserted = self._node.last_child
+
+        if inserted is None:
+            raise Exception("Could not find adopted element")
+
+        inserted = _repair_copy(other._node, inserted)
+
+        if move and other._node.parent is not None:
+            _detach(other._node)
+
+        return Element._from_node(inserted, self._cache)
+
     @property
     def tag_string(self) -> str:
         """Get the opening tag string."""
         parts = [self.name]
-        for k, v in self.attributes.items():
+        for k, v in self._node.attrs.items():
             parts.append(f'{k}="{v}"')
         return f"<{' '.join(parts)}>"
 
@@ -232,6 +769,8 @@ class Element(Content):
 
     def insert(self, element: "Element", index: int = 0) -> None:
         """Insert a child element at the specified index."""
+        _mutated()
+
         if index < 0:
             self._node.insert_child(element._node)
             return
@@ -256,8 +795,7 @@ class Element(Content):
 
     def remove_children(self) -> None:
         """Remove all child elements."""
-        while self._node.child:
-            self._node.child.remove()
+        _remove_children(self._node)
 
     def _create_tag(self, name: str, text: Optional[str] = None, **kwargs) -> "Element":
         """Create a new tag."""
@@ -269,6 +807,30 @@ class Element(Content):
 
         return prettify_element(self, indent, max_line_length)
 
+    def iter_pretty(
+        self, indent: int = 2, max_line_length: Optional[int] = 88
+    ) -> Iterator[str]:
+        """Yield the prettified element in chunks instead of building the whole string."""
+        from minestrone.element.prettifier import iter_prettify_element
+
+        return iter_prettify_element(self, indent, max_line_length)
+
+    def write_pretty(
+        self, fp: SupportsWrite, indent: int = 2, max_line_length: Optional[int] = 88
+    ) -> None:
+        """Write the prettified element to a file-like object as it is generated."""
+        for chunk in self.iter_pretty(indent, max_line_length):
+            fp.write(chunk)
+
+    def iter_html(self) -> Iterator[str]:
+        """Yield the element's HTML in chunks instead of building the whole string."""
+        return iter_node_html(self._node)
+
+    def write_to(self, fp: SupportsWrite) -> None:
+        """Write the element's HTML to a file-like object as it is generated."""
+        for chunk in self.iter_html():
+            fp.write(chunk)
+
     def __str__(self) -> str:
         return self._node.html or ""
 
@@ -1,155 +1,211 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
+
+from selectolax.lexbor import LexborNode
 
 from minestrone.element import VOID_ELEMENTS, Element
 
+# Number of strings to buffer before they get yielded as one chunk
+CHUNK_SIZE = 1024
 
-def prettify_element(
+
+class _Frame:
+    """An element with child elements that is being prettified."""
+
+    __slots__ = ("node", "spaces", "child", "has_children")
+
+    def __init__(self, node: LexborNode, spaces: int) -> None:
+        self.node = node
+        self.spaces = spaces
+        self.child = node.child
+        self.has_children = False
+
+
+def _tag_string(node: LexborNode) -> str:
+    parts = [node.tag or ""]
+
+    for k, v in node.attrs.items():
+        parts.append(f'{k}="{v}"')
+
+    return f"<{' '.join(parts)}>"
+
+
+def _closing_tag_string(node: LexborNode) -> str:
+    name = node.tag or ""
+
+    if name in VOID_ELEMENTS:
+        return ""
+
+    return f"</{name}>"
+
+
+def _has_child_elements(node: LexborNode) -> bool:
+    curr = node.child
+
+    while curr:
+        if curr.is_element_node:
+            return True
+
+        curr = curr.next
+
+    return False
+
+
+def iter_prettify_element(
     element: Element,
     indent: int,
     max_line_length: Optional[int],
     spaces: str = "",
-) -> str:
-    def __increase_spaces(_spaces: str) -> str:
-        return " " * (len(_spaces) + indent)
+) -> Iterator[str]:
+    """Yield chunks of the prettified element.
 
-    def __decrease_spaces(_spaces: str) -> str:
-        return " " * (len(_spaces) - indent)
+    Uses an explicit stack instead of recursion and visits every node once, so it
+    handles very deep or wide HTML.
+    """
 
-    def __append_newline_if_needed(_strings: List[str]) -> None:
-        if _strings and not _strings[-1].endswith("\n"):
-            _strings.append("\n")
+    strings: List[str] = []
+    last = ""
 
-    def __append_string(_strings: List[str], _string: Optional[str]) -> None:
-        if _string:
-            _strings.append(_string)
+    def __append_string(_string: Optional[str]) -> None:
+        nonlocal last
 
-    strings = []
-    __append_string(strings, spaces)
-    __append_string(strings, element.tag_string)
+        if _string:
+            strings.append(_string)
+            last = _string
 
-    content_children = []
+    def __append_newline_if_needed() -> None:
+        if last and not last.endswith("\n"):
+            __append_string("\n")
 
-    # We access the raw node to traverse
-    curr = element._node.child
-    while curr:
-        content_children.append(curr)
-        curr = curr.next
+    def __get_text(_node: LexborNode, _spaces: int) -> str:
+        child_text = _node.text()
 
-    has_children = False
-
-    child_elements = list(element.children)
-
-    for child_element in child_elements:
-        if has_children is False:
-            if content_children:
-                extra_child_spaces = __increase_spaces(spaces)
-
-                for content_child in content_children.copy():
-                    # Stop if we hit the current child element
-                    if content_child.mem_id == child_element._node.mem_id:
-                        break
-
-                    content_children.pop(0)
-
-                    if content_child.is_text_node:
-                        child_text = content_child.text()
-                        if child_text:
-                            child_text = child_text.strip()
-
-                        if child_text:
-                            # Make sure that any newlines are indented to the correct number of spaces
-                            child_text = child_text.replace(
-                                "\n", f"\n{extra_child_spaces}"
-                            )
-
-                            __append_string(strings, "\n")
-                            __append_string(strings, extra_child_spaces)
-                            __append_string(strings, child_text)
-                    elif content_child.is_comment_node:
-                        __append_string(strings, "\n")
-                        __append_string(strings, extra_child_spaces)
-                        __append_string(
-                            strings, f"<!-- {content_child.comment_content} -->"
-                        )
-
-            if element.name not in VOID_ELEMENTS:
-                # Only increase the number of spaces if the current element can have children
-                # and it's the first child
-                spaces = __increase_spaces(spaces)
-
-        __append_newline_if_needed(strings)
-
-        has_children = True
-        __append_string(
-            strings,
-            prettify_element(child_element, indent, max_line_length, spaces=spaces),
-        )
-
-        if (
-            content_children
-            and content_children[0].mem_id == child_element._node.mem_id
-        ):
-            content_children.pop(0)
-
-        if content_children:
-            extra_child_spaces = __increase_spaces(spaces)
-
-            for child in content_children.copy():
-                # Stop if we hit next element (not text/comment)
-                if child.is_element_node:
-                    break
-
-                content_children.pop(0)
-
-                if child.is_text_node:
-                    child_text = child.text()
-                    if child_text:
-                        child_text = child_text.strip()
+        if child_text:
+            child_text = child_text.strip()
 
-                    if child_text:
-                        # Make sure that any newlines are indented to the correct number of spaces
-                        child_text = child_text.replace("\n", f"\n{spaces}")
-                        __append_string(strings, spaces)
+        if child_text:
+            # Make sure that any newlines are indented to the correct number of spaces
+            return child_text.replace("\n", f"\n{' ' * _spaces}")
 
-                        __append_string(strings, child_text)
+        return ""
 
-                elif child.is_comment_node:
-                    __append_string(strings, spaces)
-                    __append_string(strings, f"<!-- {child.comment_content} -->")
+    def __start_element(_node: LexborNode, _spaces: int) -> Optional[_Frame]:
+        """Add the opening tag; returns a `_Frame` if there are child elements to visit."""
+        __append_string(" " * _spaces)
+        __append_string(_tag_string(_node))
 
-    if has_children:
-        spaces = __decrease_spaces(spaces)
+        if _has_child_elements(_node):
+            return _Frame(_node, _spaces)
 
-        __append_newline_if_needed(strings)
-        __append_string(strings, spaces)
-        __append_string(strings, element.closing_tag_string)
-    else:
         is_long_line = False
-        text_content = element.text or ""
 
-        if max_line_length is not None and len(text_content) > max_line_length:
-            is_long_line = True
+        if max_line_length is not None:
+            text_length = 0
+            curr = _node.child
+
+            while curr:
+                if curr.is_text_node:
+                    text_length += len(curr.text_content or "")
+                else:
+                    text_length += len(curr.html or "")
+
+                curr = curr.next
+
+            is_long_line = text_length > max_line_length
 
         if is_long_line:
-            spaces = __increase_spaces(spaces)
-            __append_string(strings, "\n")
-            __append_string(strings, spaces)
-
-        for child in content_children:
-            if child.is_text_node:
-                __append_string(strings, child.text())
-            elif child.is_comment_node:
-                __append_string(strings, f"<!-- {child.comment_content} -->")
-            elif child.is_element_node:
-                pass
+            __append_string("\n")
+            __append_string(" " * (_spaces + indent))
+
+        curr = _node.child
+
+        while curr:
+            if curr.is_text_node:
+                __append_string(curr.text())
+            elif curr.is_comment_node:
+                __append_string(f"<!-- {curr.comment_content} -->")
+
+            curr = curr.next
 
         if is_long_line:
-            spaces = __decrease_spaces(spaces)
-            __append_string(strings, "\n")
-            __append_string(strings, spaces)
+            __append_string("\n")
+            __append_string(" " * _spaces)
+
+        __append_string(_closing_tag_string(_node))
+        __append_newline_if_needed()
+
+        return None
+
+    stack: List[_Frame] = []
+    frame = __start_element(element._node, len(spaces))
+
+    if frame:
+        stack.append(frame)
+
+    while stack:
+        frame = stack[-1]
+        curr = frame.child
+
+        if curr is None:
+            stack.pop()
 
-        __append_string(strings, element.closing_tag_string)
+            __append_newline_if_needed()
+            __append_string(" " * max(frame.spaces - indent, 0))
+            __append_string(_closing_tag_string(frame.node))
+            __append_newline_if_needed()
+        else:
+            frame.child = curr.next
 
-    __append_newline_if_needed(strings)
+            if curr.is_element_node:
+                if frame.has_children is False:
+                    frame.has_children = True
 
-    return "".join(strings)
+                    if frame.node.tag not in VOID_ELEMENTS:
+                        # Only increase the number of spaces if the current element can
+                        # have children and it's the first child
+                        frame.spaces += indent
+
+                __append_newline_if_needed()
+                child_frame = __start_element(curr, frame.spaces)
+
+                if child_frame:
+                    stack.append(child_frame)
+            elif frame.has_children is False:
+                # Text and comments before the first child element go on their own line
+                extra_child_spaces = frame.spaces + indent
+
+                if curr.is_text_node:
+                    child_text = __get_text(curr, extra_child_spaces)
+
+                    if child_text:
+                        __append_string("\n")
+                        __append_string(" " * extra_child_spaces)
+                        __append_string(child_text)
+                elif curr.is_comment_node:
+                    __append_string("\n")
+                    __append_string(" " * extra_child_spaces)
+                    __append_string(f"<!-- {curr.comment_content} -->")
+            elif curr.is_text_node:
+                child_text = __get_text(curr, frame.spaces)
+
+                if child_text:
+                    __append_string(" " * frame.spaces)
+                    __append_string(child_text)
+            elif curr.is_comment_node:
+                __append_string(" " * frame.spaces)
+                __append_string(f"<!-- {curr.comment_content} -->")
+
+        if len(strings) >= CHUNK_SIZE:
+            yield "".join(strings)
+            strings.clear()
+
+    if strings:
+        yield "".join(strings)
+
+
+def prettify_element(
+    element: Element,
+    indent: int,
+    max_line_length: Optional[int],
+    spaces: str = "",
+) -> str:
+    return "".join(iter_prettify_element(element, indent, max_line_length, spaces))
@@ -0,0 +1,90 @@
+from typing import Iterator, List, Optional, Tuple
+
+from selectolax.lexbor import LexborNode
+
+# Number of strings to buffer before they get yielded as one chunk
+CHUNK_SIZE = 1024
+
+# Elements that are always serialized by `selectolax` in one piece because their
+# children are raw text or they are foreign content with case-sensitive attributes
+NATIVE_ELEMENTS = {
+    "iframe",
+    "math",
+    "noembed",
+    "noframes",
+    "noscript",
+    "plaintext",
+    "script",
+    "style",
+    "svg",
+    "template",
+    "textarea",
+    "title",
+    "xmp",
+}
+
+ATTRIBUTE_ESCAPES = str.maketrans(
+    {
+        "&": "&amp;",
+        "\xa0": "&nbsp;",
+        '"': "&quot;",
+        "<": "&lt;",
+        ">": "&gt;",
+    }
+)
+
+
+def _opening_tag(node: LexborNode) -> str:
+    parts = [node.tag or ""]
+
+    for k, v in node.attrs.items():
+        if v is None:
+            parts.append(k)
+        else:
+            parts.append(f'{k}="{v.translate(ATTRIBUTE_ESCAPES)}"')
+
+    return f"<{' '.join(parts)}>"
+
+
+def iter_node_html(node: LexborNode) -> Iterator[str]:
+    """Yield chunks of the node's HTML, the same as `node.html`.
+
+    Elements with child elements are opened and closed here so that only one leaf is
+    serialized by `selectolax` at a time instead of the whole subtree.
+    """
+
+    strings: List[str] = []
+
+    # The next sibling to serialize after an open element is closed, and its tag
+    stack: List[Tuple[Optional[LexborNode], str]] = []
+
+    curr = node
+    is_root = True
+
+    while True:
+        if curr is not None:
+            if (
+                curr.is_element_node
+                and curr.child is not None
+                and curr.tag not in NATIVE_ELEMENTS
+            ):
+                strings.append(_opening_tag(curr))
+                stack.append((None if is_root else curr.next, curr.tag or ""))
+                curr = curr.child
+            else:
+                strings.append(curr.html or "")
+                curr = None if is_root else curr.next
+
+            is_root = False
+        elif stack:
+            curr, tag = stack.pop()
+            strings.append(f"</{tag}>")
+        else:
+            break
+
+        if len(strings) >= CHUNK_SIZE:
+            yield "".join(strings)
+            strings.clear()
+
+    if strings:
+        yield "".join(strings)
@@ -0,0 +1,90 @@
+from typing import Collection, Dict, Iterator, List, Optional, Tuple, Union
+
+from selectolax.lexbor import LexborNode
+
+from minestrone.element import Content, Element, Text
+
+START = "start"
+END = "end"
+TEXT = "text"
+
+Event = Tuple[str, Union[Element, Text]]
+
+
+class Walker:
+    """Walk a subtree depth-first and yield `(event, node)` pairs in document order.
+
+    Elements yield a `"start"` event before their children and an `"end"` event after
+    them, and text yields a `"text"` event. Call `skip` after a `"start"` event to not
+    visit the children of that element; its `"end"` event is still yielded. Nodes are
+    only visited as the walker is iterated, so breaking out of the loop stops the walk.
+    """
+
+    __slots__ = ("_node", "_cache", "_transparent_tags", "_skipping")
+
+    def __init__(
+        self,
+        node: Optional[LexborNode],
+        cache: Optional[Dict[int, Content]] = None,
+        transparent_tags: Collection[str] = (),
+    ) -> None:
+        """Initialize Walker.
+
+        Elements with a tag in `transparent_tags` do not yield events, but their
+        children are still walked.
+        """
+        self._node = node
+        self._cache = cache
+        self._transparent_tags = transparent_tags
+        self._skipping = False
+
+    def skip(self) -> None:
+        """Do not walk the children of the element from the last `"start"` event."""
+        self._skipping = True
+
+    def __iter__(self) -> Iterator[Event]:
+        root = self._node
+        cache = self._cache
+
+        # The elements whose children are being walked, and their wrapper if they have
+        # events
+        stack: List[Tuple[LexborNode, Optional[Element]]] = []
+
+        curr = root
+
+        while True:
+            if curr is not None:
+                if curr.is_element_node:
+                    element = None
+                    descend = True
+
+                    if curr.tag not in self._transparent_tags:
+                        element = Element._from_node(curr, cache)
+                        self._skipping = False
+
+                        yield (START, element)
+
+                        descend = not self._skipping
+                        self._skipping = False
+
+                    if descend and curr.child is not None:
+                        stack.append((curr, element))
+                        curr = curr.child
+                        continue
+
+                    if element is not None:
+                        yield (END, element)
+                elif curr.is_text_node:
+                    yield (TEXT, Text._from_node(curr, cache))
+
+                # The root is walked on its own, without its siblings
+                curr = curr.next if stack else None
+            elif stack:
+                parent, element = stack.pop()
+
+                if element is not None:
+                    yield (END, element)
+
+                curr = parent.next if stack else None
+            else:
+                break
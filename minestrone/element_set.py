@@ -0,0 +1,113 @@
+"""Operate on all of the elements that match a query at once."""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from selectolax.lexbor import LexborNode
+
+from minestrone.element import Content, Element, _convert_attribute, _mutated
+
+
+class ElementSet:
+    """The `Element`s that match a query, with methods that change all of them at once.
+
+    Each method makes one pass over the nodes directly instead of creating an `Element`
+    for every node.
+    """
+
+    __slots__ = ("_nodes", "_cache")
+
+    def __init__(
+        self, nodes: List[LexborNode], cache: Optional[Dict[int, Content]] = None
+    ) -> None:
+        """Initialize ElementSet."""
+        self._nodes = nodes
+        self._cache = cache
+
+    def set_attr(self, name: str, value: Any) -> "ElementSet":
+        """Set the attribute on every element."""
+        _mutated()
+
+        (name, value) = _convert_attribute(name, value)
+
+        for node in self._nodes:
+            node.attrs[name] = value
+
+        return self
+
+    def remove_attr(self, name: str) -> "ElementSet":
+        """Remove the attribute from every element that has it."""
+        _mutated()
+
+        for node in self._nodes:
+            attrs = node.attrs
+
+            if name in attrs:
+                del attrs[name]
+
+        return self
+
+    def add_class(self, *names: str) -> "ElementSet":
+        """Add the classes to every element that does not already have them."""
+        _mutated()
+
+        for node in self._nodes:
+            attrs = node.attrs
+            value = attrs.get("class")
+
+            if not value:
+                attrs["class"] = " ".join(names)
+                continue
+
+            classes = value.split()
+            missing = [name for name in names if name not in classes]
+
+            if missing:
+                attrs["class"] = " ".join(classes + missing)
+
+        return self
+
+    def remove(self) -> None:
+        """Remove every element from the document; the set is empty afterwards."""
+        _mutated()
+
+        # Go backwards so descendants are removed before their ancestors destroy them
+        for node in reversed(self._nodes):
+            if self._cache is not None:
+                self._cache.pop(node.mem_id, None)
+
+            node.decompose()
+
+        self._nodes = []
+
+    def unwrap(self) -> None:
+        """Replace every element with its children; the set is empty afterwards."""
+        _mutated()
+
+        # Go backwards so descendants are unwrapped before their ancestors
+        for node in reversed(self._nodes):
+            if self._cache is not None:
+                self._cache.pop(node.mem_id, None)
+
+            node.unwrap(delete_empty=True)
+
+        self._nodes = []
+
+    def texts(self, strip: bool = False) -> List[str]:
+        """Get the text content of every element."""
+        return [node.text(strip=strip) for node in self._nodes]
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __bool__(self) -> bool:
+        return bool(self._nodes)
+
+    def __iter__(self) -> Iterator[Element]:
+        for node in self._nodes:
+            yield Element._from_node(node, self._cache)
+
+    def __getitem__(self, index: int) -> Element:
+        return Element._from_node(self._nodes[index], self._cache)
+
+    def __repr__(self) -> str:
+        return f"ElementSet({list(self)!r})"
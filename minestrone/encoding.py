@@ -0,0 +1,110 @@
+"""Detect the character encoding of HTML bytes."""
+
+import codecs
+import re
+from typing import Optional, Tuple
+
+# How many bytes to look through for a `<meta>` charset, the same as browsers
+SNIFF_LENGTH = 1024
+
+DEFAULT_ENCODING = "utf-8"
+
+# What browsers decode bytes as when they are not UTF-8 and no encoding was declared
+FALLBACK_ENCODING = "windows-1252"
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# Handles `charset=...` in a `Content-Type` header or `<meta http-equiv>` content
+CHARSET_REGEX = re.compile(r"charset\s*=\s*[\"']?\s*([\w.:+-]+)", re.IGNORECASE)
+
+META_CHARSET_REGEX = re.compile(
+    rb"<meta\s[^>]*?charset\s*=\s*[\"']?\s*([\w.:+-]+)", re.IGNORECASE
+)
+
+
+def normalize_encoding(encoding: str) -> Optional[str]:
+    """Get the canonical `codecs` name for the encoding, or `None` if it is unknown."""
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return None
+
+
+def is_utf8(encoding: str) -> bool:
+    """Whether the encoding can be parsed without decoding, i.e. it is UTF-8 or ASCII."""
+    return normalize_encoding(encoding) in ("utf-8", "ascii")
+
+
+def _get_charset(encoding: str) -> str:
+    """Get the charset from a `Content-Type` header value, or the value as-is."""
+    match = CHARSET_REGEX.search(encoding)
+
+    if match:
+        return match.group(1)
+
+    return encoding.strip()
+
+
+def sniff_encoding(html: bytes, encoding: Optional[str] = None) -> Tuple[str, int]:
+    """Detect the encoding of the HTML and the length of its byte order mark.
+
+    Like browsers, a byte order mark wins, then the `encoding` (which can also be a
+    `Content-Type` header value), then a `<meta>` charset in the first kilobyte, and
+    finally UTF-8.
+    """
+
+    for bom, bom_encoding in BOMS:
+        if html.startswith(bom):
+            return (bom_encoding, len(bom))
+
+    if encoding:
+        return (_get_charset(encoding), 0)
+
+    match = META_CHARSET_REGEX.search(html, 0, SNIFF_LENGTH)
+
+    if match:
+        meta_encoding = match.group(1).decode("ascii")
+
+        # A `<meta>` can only be read if the encoding is ASCII-compatible, so UTF-16
+        # must be wrong
+        if normalize_encoding(meta_encoding) not in (
+            None,
+            "utf-16",
+            "utf-16-le",
+            "utf-16-be",
+        ):
+            return (meta_encoding, 0)
+
+    return (DEFAULT_ENCODING, 0)
+
+
+def is_valid_utf8(html: bytes) -> bool:
+    """Whether the bytes can be decoded as UTF-8."""
+    if html.isascii():
+        return True
+
+    try:
+        html.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+
+    return True
+
+
+def get_fallback_encoding(html: bytes, encoding: Optional[str] = None) -> str:
+    """Get the encoding for bytes that are supposed to be UTF-8 but are not.
+
+    Like browsers, `windows-1252` is used if no encoding was declared; otherwise the
+    bytes are still decoded as UTF-8 (with replacement characters).
+    """
+    if encoding or any(html.startswith(bom) for bom, _ in BOMS):
+        return DEFAULT_ENCODING
+
+    if META_CHARSET_REGEX.search(html, 0, SNIFF_LENGTH):
+        return DEFAULT_ENCODING
+
+    return FALLBACK_ENCODING
@@ -0,0 +1,108 @@
+"""Look up elements by id, tag, or class without running a CSS query each time."""
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+from minestrone import element
+from minestrone.element import Element
+
+if TYPE_CHECKING:
+    from minestrone import HTML
+
+__all__ = [
+    "Index",
+]
+
+
+class Index:
+    """Maps of id, tag, and class to the `Element`s of an `HTML` document.
+
+    All of the maps are built in one traversal of the document. Changing the document
+    through an `Element` (or an `ElementSet`) makes the index stale, and it is rebuilt
+    on the next lookup.
+    """
+
+    __slots__ = ("_html", "_parser", "_generation", "_ids", "_tags", "_classes")
+
+    def __init__(self, html: "HTML") -> None:
+        """Initialize Index."""
+        self._html = html
+        self._parser: Optional[LexborHTMLParser] = None
+        self._generation = -1
+        self._ids: Dict[str, LexborNode] = {}
+        self._tags: Dict[str, List[LexborNode]] = {}
+        self._classes: Dict[str, List[LexborNode]] = {}
+
+    def _build(self) -> None:
+        parser = self._html._parser
+        ids: Dict[str, LexborNode] = {}
+        tags: Dict[str, List[LexborNode]] = {}
+        classes: Dict[str, List[LexborNode]] = {}
+
+        skip_tags = ("html", "head", "body") if self._html._input_is_fragment else ()
+
+        if parser.root is not None:
+            for node in parser.root.traverse():
+                if not node.is_element_node:
+                    continue
+
+                # Lookups are case-insensitive, and SVG tags like `clipPath` keep their case
+                tag = (node.tag or "").lower()
+
+                if tag in skip_tags:
+                    continue
+
+                tags.setdefault(tag, []).append(node)
+
+                attrs = node.attrs
+                id = attrs.get("id")
+
+                # Like `getElementById`, the first element with the id wins
+                if id and id not in ids:
+                    ids[id] = node
+
+                class_names = attrs.get("class")
+
+                if class_names:
+                    # A class that is repeated on an element only indexes it once
+                    for name in dict.fromkeys(class_names.split()):
+                        classes.setdefault(name, []).append(node)
+
+        self._parser = parser
+        self._generation = element._generation
+        self._ids = ids
+        self._tags = tags
+        self._classes = classes
+
+    def _ensure_current(self) -> None:
+        if (
+            self._generation != element._generation
+            or self._parser is not self._html._parsed_html
+        ):
+            self._build()
+
+    def get_by_id(self, id: str) -> Optional[Element]:
+        """Get the first `Element` with the id, or `None`."""
+        self._ensure_current()
+        node = self._ids.get(id)
+
+        if node is None:
+            return None
+
+        return self._html._element(node)
+
+    def get_by_tag(self, name: str) -> List[Element]:
+        """Get the `Element`s with the tag name in document order."""
+        self._ensure_current()
+
+        return [self._html._element(node) for node in self._tags.get(name.lower(), [])]
+
+    def get_by_class(self, name: str) -> List[Element]:
+        """Get the `Element`s that have the class in document order."""
+        self._ensure_current()
+
+        return [self._html._element(node) for node in self._classes.get(name, [])]
+
+    def __repr__(self) -> str:
+        return f"Index(ids={len(self._ids)}, tags={len(self._tags)}, classes={len(self._classes)})"
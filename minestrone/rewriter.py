@@ -0,0 +1,92 @@
+"""Apply many rewrite rules to HTML in one pass."""
+
+from typing import Callable, Dict, List, Optional, Tuple, Union, overload
+
+from selectolax.lexbor import LexborNode
+
+from minestrone import HTML, element
+from minestrone.element import Element
+from minestrone.selector import Selector, compile
+
+__all__ = [
+    "Rewriter",
+]
+
+Handler = Callable[[Element], None]
+
+
+class Rewriter:
+    """Rewrite HTML with handlers that are registered for CSS selectors.
+
+    The handlers are called in the order they were registered, each with the elements
+    that match its selector in document order. A selector with multiple handlers is
+    only matched once, unless a handler changed the document in between; then the
+    selectors are matched again so that no handler gets an element that an earlier
+    handler removed or replaced.
+    """
+
+    def __init__(self) -> None:
+        """Initialize Rewriter."""
+        self._rules: List[Tuple[Selector, Handler]] = []
+
+    @overload
+    def on(self, selector: Union[str, Selector], handler: Handler) -> "Rewriter": ...
+
+    @overload
+    def on(
+        self, selector: Union[str, Selector], handler: None = None
+    ) -> Callable[[Handler], Handler]: ...
+
+    def on(
+        self, selector: Union[str, Selector], handler: Optional[Handler] = None
+    ) -> Union["Rewriter", Callable[[Handler], Handler]]:
+        """Register a handler for the elements that match the CSS selector.
+
+        Returns the `Rewriter` so calls can be chained, or can be used as a decorator
+        when `handler` is not passed in.
+        """
+        compiled = compile(selector)
+
+        if handler is None:
+
+            def decorator(_handler: Handler) -> Handler:
+                self._rules.append((compiled, _handler))
+                return _handler
+
+            return decorator
+
+        self._rules.append((compiled, handler))
+
+        return self
+
+    def rewrite(self, html: HTML) -> HTML:
+        """Apply all of the handlers to the HTML in place; returns the same `HTML`."""
+        if not self._rules:
+            return html
+
+        parser = html._parser
+        matches: Dict[Selector, List[LexborNode]] = {}
+        generation = element._generation
+
+        for selector, handler in self._rules:
+            # The nodes that were matched before a handler changed the document may
+            # have been destroyed, so they must not be touched again
+            if generation != element._generation:
+                matches.clear()
+                generation = element._generation
+
+            nodes = matches.get(selector)
+
+            if nodes is None:
+                nodes = matches[selector] = selector._select(parser)
+
+            for node in nodes:
+                handler(html._element(node))
+
+        return html
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __repr__(self) -> str:
+        return f"Rewriter({[str(selector) for selector, _ in self._rules]!r})"
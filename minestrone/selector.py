@@ -0,0 +1,177 @@
+"""Reusable CSS selectors for minestrone."""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Union
+
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+SELECTOR_CACHE_SIZE = 256
+
+# Selectors that are only a tag name (or `*`) can skip the CSS engine entirely
+TAG_SELECTOR_REGEX = re.compile(r"^(\*|[a-zA-Z][a-zA-Z0-9-]*)$")
+
+# Empty document used to validate selectors when they get compiled
+_validation_parser = LexborHTMLParser("")
+
+
+class Selector:
+    """A CSS selector that is validated once and can be reused across documents."""
+
+    __slots__ = ("pattern", "_tag")
+
+    def __init__(self, pattern: str) -> None:
+        """Initialize Selector."""
+        pattern = pattern.strip()
+
+        if not pattern:
+            raise ValueError("Selector cannot be empty")
+
+        # Raises `SelectolaxError` for invalid selectors
+        _validation_parser.css(pattern)
+
+        self.pattern = pattern
+        self._tag = pattern.lower() if TAG_SELECTOR_REGEX.match(pattern) else None
+
+    def _select(self, parser: LexborHTMLParser) -> List[LexborNode]:
+        """Get all nodes in the document that match the selector."""
+        if self._tag:
+            return parser.tags(self._tag)
+
+        return parser.css(self.pattern)
+
+    def _select_first(self, parser: LexborHTMLParser) -> Optional[LexborNode]:
+        """Get the first node in the document that matches the selector.
+
+        The CSS engine stops at the first match instead of collecting all of them.
+        """
+        return parser.css_first(self.pattern)
+
+    def _exists(self, parser: LexborHTMLParser) -> bool:
+        """Whether any node in the document matches the selector."""
+        return bool(parser.any_css_matches((self.pattern,)))
+
+    def _select_descendants(self, node: LexborNode) -> List[LexborNode]:
+        """Get all of the node's descendants that match the selector."""
+        nodes = node.css(self.pattern)
+
+        # The CSS engine also matches the node itself, which is always the first result
+        if nodes and nodes[0].mem_id == node.mem_id:
+            return nodes[1:]
+
+        return nodes
+
+    def _select_first_descendant(self, node: LexborNode) -> Optional[LexborNode]:
+        """Get the node's first descendant that matches the selector."""
+        first = node.css_first(self.pattern)
+
+        if first is None or first.mem_id != node.mem_id:
+            return first
+
+        # The node itself matched, so search each child's subtree in order instead
+        child = node.child
+
+        while child is not None:
+            if child.is_element_node:
+                first = child.css_first(self.pattern)
+
+                if first is not None:
+                    return first
+
+            child = child.next
+
+        return None
+
+    def _matches(self, node: LexborNode) -> bool:
+        """Whether the node itself matches the selector.
+
+        Unless the selector is only a tag name, the CSS engine searches the node's whole
+        subtree, so this costs as much as a query of the node.
+        """
+        if self._tag:
+            return self._tag == "*" or (node.tag or "").lower() == self._tag
+
+        # The node comes before its descendants, so the first match is the node if it
+        # matches at all
+        first = node.css_first(self.pattern)
+
+        return first is not None and first.mem_id == node.mem_id
+
+    def _closest(self, node: LexborNode) -> Optional[LexborNode]:
+        """Get the node or its nearest ancestor element that matches the selector."""
+        ancestors = []
+        curr: Optional[LexborNode] = node
+
+        while curr is not None and curr.is_element_node:
+            ancestors.append(curr)
+            curr = curr.parent
+
+        if not ancestors or self._tag:
+            return next((a for a in ancestors if self._matches(a)), None)
+
+        # Query from the outermost ancestor once instead of searching the subtree of
+        # every ancestor
+        matched = {match.mem_id for match in ancestors[-1].css(self.pattern)}
+
+        return next((a for a in ancestors if a.mem_id in matched), None)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Selector):
+            return self.pattern == other.pattern
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.pattern)
+
+    def __str__(self) -> str:
+        return self.pattern
+
+    def __repr__(self) -> str:
+        return f"Selector({self.pattern!r})"
+
+
+@lru_cache(maxsize=SELECTOR_CACHE_SIZE)
+def _compile(pattern: str) -> Selector:
+    return Selector(pattern)
+
+
+def compile(selector: Union[str, Selector]) -> Selector:
+    """Get a `Selector` for the CSS selector; strings are cached in an LRU cache."""
+    if isinstance(selector, Selector):
+        return selector
+
+    return _compile(selector)
+
+
+def select_many(
+    parser: LexborHTMLParser, selectors: Mapping[str, Selector]
+) -> Dict[str, List[LexborNode]]:
+    """Get the nodes that match each selector, in document order for each of them.
+
+    Selectors that are only a tag name are matched together in one query and then split
+    up by tag, and every other distinct selector is queried once.
+    """
+    matches: Dict[str, List[LexborNode]] = {}
+    tags: Dict[str, List[LexborNode]] = {}
+
+    for selector in selectors.values():
+        if selector._tag and selector._tag != "*":
+            tags[selector._tag] = []
+        elif selector.pattern not in matches:
+            matches[selector.pattern] = selector._select(parser)
+
+    if len(tags) == 1:
+        (tag,) = tags
+        tags[tag] = parser.tags(tag)
+    elif tags:
+        # Every node matches exactly one of the tags, so there are no duplicates
+        for node in parser.css(", ".join(tags)):
+            tags[(node.tag or "").lower()].append(node)
+
+    return {
+        name: list(tags[selector._tag])
+        if selector._tag in tags
+        else list(matches[selector.pattern])
+        for name, selector in selectors.items()
+    }
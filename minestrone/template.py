@@ -0,0 +1,151 @@
+"""Render the same HTML many times by filling in slots of a tree that is parsed once."""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from selectolax.lexbor import LexborNode
+
+from minestrone import HTML
+from minestrone.element import (
+    Path,
+    _convert_attribute,
+    _follow_path,
+    _get_path,
+    _remove_children,
+)
+from minestrone.selector import Selector, compile
+
+__all__ = [
+    "Template",
+]
+
+DEFAULT_SLOT_ATTRIBUTE = "data-slot"
+
+
+def _convert_attributes(attributes: Dict[str, Any]) -> List[Tuple[str, Optional[str]]]:
+    """Convert the attributes once per render; `None` means the attribute is removed."""
+    converted: List[Tuple[str, Optional[str]]] = []
+
+    for k, v in attributes.items():
+        if v is None or v is False:
+            converted.append((_convert_attribute(k, "")[0], None))
+        else:
+            converted.append(_convert_attribute(k, v))
+
+    return converted
+
+
+def _patch_attributes(
+    node: LexborNode, attributes: List[Tuple[str, Optional[str]]]
+) -> None:
+    attrs = node.attrs
+
+    for k, v in attributes:
+        if v is None:
+            if k in attrs:
+                del attrs[k]
+        else:
+            attrs[k] = v
+
+
+def _patch_text(node: LexborNode, text: str) -> None:
+    _remove_children(node)
+    node.insert_child(text)
+
+
+class Template:
+    """HTML that is parsed once and rendered by patching text and attributes of slots.
+
+    Slots are elements with the `slot_attribute` (the attribute's value is the name of
+    the slot) or elements that match the CSS selectors in `slots`. The
+    `slot_attribute` is removed from the rendered HTML.
+    """
+
+    def __init__(
+        self,
+        html: Union[str, bytes, HTML],
+        slots: Optional[Mapping[str, Union[str, Selector]]] = None,
+        slot_attribute: Optional[str] = DEFAULT_SLOT_ATTRIBUTE,
+    ) -> None:
+        """Initialize Template."""
+        # Slot attributes get removed, so never change the `HTML` that was passed in
+        self._html = html.clone() if isinstance(html, HTML) else HTML(html)
+        self._paths: Dict[str, List[Path]] = {}
+
+        parser = self._html._parser
+        root = parser.root
+
+        if root is None:
+            raise ValueError("Template does not have any HTML")
+
+        if slot_attribute:
+            for node in compile(f"[{slot_attribute}]")._select(parser):
+                name = node.attrs.get(slot_attribute) or ""
+                self._paths.setdefault(name, []).append(_get_path(node, root))
+
+                del node.attrs[slot_attribute]
+
+        for name, selector in (slots or {}).items():
+            paths = self._paths.setdefault(name, [])
+
+            for node in compile(selector)._select(parser):
+                paths.append(_get_path(node, root))
+
+    @property
+    def slots(self) -> List[str]:
+        """The names of the slots."""
+        return list(self._paths)
+
+    def render(self, values: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> HTML:
+        """Create new `HTML` from the template with the values patched into the slots.
+
+        A value sets the text of its slots, or their attributes if it is a `dict` (an
+        attribute with a value of `None` or `False` is removed). Slots without a value
+        are left as they are, and slots inside of a slot that gets text are skipped.
+        """
+        html = self._html.clone()
+        root = html._parser.root
+
+        if root is None:
+            return html
+
+        values = {**(values or {}), **kwargs}
+
+        for name in values:
+            if name not in self._paths:
+                raise KeyError(f"Unknown slot: {name}")
+
+        # The text of a slot replaces any slots that are nested inside of it
+        text_paths = {
+            tuple(path)
+            for name, value in values.items()
+            if not isinstance(value, dict)
+            for path in self._paths[name]
+        }
+
+        # Find all of the nodes before any of them get patched
+        patches: List[Tuple[LexborNode, Any]] = []
+
+        for name, value in values.items():
+            patch = (
+                _convert_attributes(value) if isinstance(value, dict) else str(value)
+            )
+
+            for path in self._paths[name]:
+                if any(tuple(path[:i]) in text_paths for i in range(len(path))):
+                    continue
+
+                patches.append((_follow_path(root, path), patch))
+
+        for node, patch in patches:
+            if isinstance(patch, str):
+                _patch_text(node, patch)
+            else:
+                _patch_attributes(node, patch)
+
+        return html
+
+    def __str__(self) -> str:
+        return str(self._html)
+
+    def __repr__(self) -> str:
+        return f"Template({self.slots!r})"
@@ -0,0 +1,176 @@
+"""Call handlers for every node of HTML without creating an `Element` for each one."""
+
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+
+from selectolax.lexbor import LexborNode
+
+from minestrone import HTML
+from minestrone.element import Attributes, Content, Element
+
+__all__ = [
+    "NodeView",
+    "visit",
+]
+
+ELEMENT_KEY = "*"
+TEXT_KEY = "#text"
+COMMENT_KEY = "#comment"
+
+# The tags that `selectolax` gives text and comment nodes
+TEXT_TAG = "-text"
+COMMENT_TAG = "-comment"
+
+# The tag that `selectolax` gives the doctype
+DOCTYPE_TAG = "-doctype"
+
+# The nodes that a fragment gets wrapped in
+FRAGMENT_TAGS = ("html", "head", "body")
+
+
+class NodeView:
+    """A lightweight view of the node that a handler is called with.
+
+    The same view is re-used for every node, so it is only valid while the handler is
+    running; use `element` to get an `Element` that can be kept.
+    """
+
+    __slots__ = ("_node", "_tag", "_cache")
+
+    def __init__(self, cache: Optional[Dict[int, Content]] = None) -> None:
+        """Initialize NodeView."""
+        self._node: Optional[LexborNode] = None
+        # Getting the tag from `selectolax` creates a new string, so it is only done once
+        self._tag: Optional[str] = None
+        self._cache = cache
+
+    @property
+    def kind(self) -> str:
+        """`"element"`, `"text"`, or `"comment"`."""
+        if self._tag == TEXT_TAG:
+            return "text"
+
+        if self._tag == COMMENT_TAG:
+            return "comment"
+
+        return "element"
+
+    @property
+    def tag(self) -> Optional[str]:
+        """The tag name of an element; `None` for text and comments."""
+        if self._tag == TEXT_TAG or self._tag == COMMENT_TAG:
+            return None
+
+        return self._tag
+
+    @property
+    def attrs(self) -> Union[Attributes, Dict[str, Optional[str]]]:
+        """A live view of the attributes of the node, like `Element.attrs`."""
+        if self._node is None:
+            return {}
+
+        return Attributes(self._node)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Get the value of an attribute, or the default if the attribute is missing."""
+        if self._node is None:
+            return default
+
+        return self._node.attrs.get(name, default)
+
+    @property
+    def text(self) -> str:
+        """The text of a text node or comment, or all of the text inside an element."""
+        node = self._node
+
+        if node is None:
+            return ""
+
+        if node.is_comment_node:
+            return node.comment_content or ""
+
+        if node.is_text_node:
+            return node.text_content or ""
+
+        return node.text()
+
+    @property
+    def element(self) -> Optional[Element]:
+        """Get an `Element` for the node; `None` for text and comments."""
+        if self._node is None or not self._node.is_element_node:
+            return None
+
+        return Element._from_node(self._node, self._cache)
+
+    def __repr__(self) -> str:
+        return f"NodeView({self.kind!r}, {self.tag!r})"
+
+
+Handler = Callable[[NodeView], Any]
+
+
+def visit(html: Union[HTML, Element], handlers: Mapping[str, Handler]) -> None:
+    """Call the handlers for the nodes of the HTML (or `Element`) in document order.
+
+    Handlers are registered by tag name, `"*"` for every element, `"#text"` for text,
+    and `"#comment"` for comments. Each handler gets a `NodeView` instead of an
+    `Element`. For an element, the `"*"` handler is called before the handler for its
+    tag name.
+    """
+
+    dispatch: Dict[str, Handler] = {}
+    element_handler = None
+
+    for key, handler in handlers.items():
+        if key == ELEMENT_KEY:
+            element_handler = handler
+        elif key == TEXT_KEY:
+            dispatch[TEXT_TAG] = handler
+        elif key == COMMENT_KEY:
+            dispatch[COMMENT_TAG] = handler
+        elif key.startswith("#"):
+            raise ValueError(f"Unknown node kind: {key}")
+        else:
+            dispatch[key.lower()] = handler
+
+    if isinstance(html, Element):
+        start: Optional[LexborNode] = html._node
+        view = NodeView(html._cache)
+        skip_tags: tuple = ()
+    else:
+        start = html._parser.root
+        view = NodeView(html._element_cache)
+        skip_tags = (DOCTYPE_TAG,)
+
+        if html._input_is_fragment:
+            skip_tags += FRAGMENT_TAGS
+
+        # Start from the document so comments outside of the `html` node are visited
+        if start is not None and start.parent is not None:
+            start = start.parent
+
+    if start is None or (not dispatch and element_handler is None):
+        return
+
+    nodes = start.traverse(include_text=TEXT_TAG in dispatch)
+
+    if start.is_document_node:
+        # The first node is the document itself
+        next(nodes, None)
+
+    for node in nodes:
+        tag = node.tag
+
+        if tag in skip_tags:
+            continue
+
+        view._node = node
+        view._tag = tag
+
+        if element_handler is not None and tag != TEXT_TAG and tag != COMMENT_TAG:
+            element_handler(view)
+
+        # Handlers are registered in lowercase, but SVG tags like `clipPath` keep their case
+        handler = dispatch.get(tag.lower())
+
+        if handler is not None:
+            handler(view)
@@ -308,3 +308,480 @@ def test_insert_index(html_doc):
     actual = str(list(ul.children)[-1])
 
     assert actual == expected
+
+
+def test_element_slots(html_doc):
+    tillie = next(html_doc.query("a#tillie"))
+
+    with pytest.raises(AttributeError):
+        tillie.__dict__  # noqa: B018
+
+
+def test_element_eq(html_doc):
+    tillie = next(html_doc.query("a#tillie"))
+    tillie_again = next(html_doc.query("#tillie"))
+    elsie = next(html_doc.query("a#elsie"))
+
+    assert tillie is not tillie_again
+    assert tillie == tillie_again
+    assert hash(tillie) == hash(tillie_again)
+    assert tillie != elsie
+    assert len({tillie, tillie_again, elsie}) == 2
+
+
+def test_element_parent_eq(html_doc):
+    ul = next(html_doc.query("ul"))
+
+    for li in ul.children:
+        assert li.parent == ul
+
+
+def test_element_attrs_is_live():
+    span = Element.create("span", id="span1")
+    attrs = span.attrs
+
+    span.id = "span2"
+
+    assert attrs["id"] == "span2"
+    assert attrs == {"id": "span2"}
+    assert "id" in attrs
+    assert "class" not in attrs
+    assert len(attrs) == 1
+
+
+def test_element_attrs_set_and_delete():
+    span = Element.create("span", id="span1")
+
+    span.attrs["klass"] = ["test-class1", "test-class2"]
+    span.attrs["disabled"] = True
+    del span.attrs["id"]
+
+    assert (
+        str(span) == '<span class="test-class1 test-class2" disabled="disabled"></span>'
+    )
+
+    with pytest.raises(KeyError):
+        del span.attrs["id"]
+
+
+def test_element_get_attribute():
+    span = Element.create("span", id="span1")
+
+    assert span.get_attribute("id") == "span1"
+    assert span.get_attribute("class") is None
+    assert span.get_attribute("class", "missing") == "missing"
+
+
+def test_element_has_attribute():
+    span = Element.create("span", id="span1")
+
+    assert span.has_attribute("id")
+    assert not span.has_attribute("class")
+
+
+def test_element_update_attributes():
+    span = Element.create("span", id="span1", klass="test-class1")
+
+    span.update_attributes({"klass": "test-class2"}, title="Dormouse")
+
+    assert span.attributes == {
+        "id": "span1",
+        "class": "test-class2",
+        "title": "Dormouse",
+    }
+
+
+def test_element_set_attributes_keeps_unchanged_order():
+    span = Element.create("span", id="span1", klass="test-class1", title="Dormouse")
+
+    span.attributes = {"id": "span1", "title": "Elsie"}
+
+    assert str(span) == '<span id="span1" title="Elsie"></span>'
+
+
+def test_clone():
+    html = HTML('<ul><li class="sister" hidden><a>Elsie</a></li></ul>')
+    ul = html.root_element
+    li = next(ul.children)
+
+    clone = li.clone()
+
+    assert clone != li
+    assert clone.parent is None
+    assert str(clone) == '<li class="sister" hidden><a>Elsie</a></li>'
+
+    clone.text = "Lacie"
+    ul.insert(clone, index=-1)
+
+    assert (
+        str(html)
+        == '<ul><li class="sister" hidden><a>Elsie</a></li><li class="sister" hidden>Lacie</li></ul>'
+    )
+
+
+def test_clone_shallow():
+    html = HTML('<ul><li class="sister" hidden><a>Elsie</a></li></ul>')
+    li = next(html.root_element.children)
+
+    clone = li.clone(deep=False)
+
+    assert str(clone) == '<li class="sister" hidden></li>'
+    assert str(li) == '<li class="sister" hidden><a>Elsie</a></li>'
+
+
+def test_clone_template():
+    html = HTML("<div><template><p>Elsie</p></template></div>")
+
+    assert (
+        str(html.root_element.clone()) == "<div><template><p>Elsie</p></template></div>"
+    )
+    assert str(next(html.root_element.children).clone()) == (
+        "<template><p>Elsie</p></template>"
+    )
+
+
+def test_clone_svg():
+    html = HTML("<div><svg><clipPath></clipPath></svg></div>")
+    svg = next(html.root_element.children)
+
+    assert (
+        str(html.root_element.clone()) == "<div><svg><clipPath></clipPath></svg></div>"
+    )
+    assert str(svg.clone()) == "<svg><clipPath></clipPath></svg>"
+
+
+def test_create_table_cell():
+    # `<td>` can't be parsed by itself outside of a table
+    td = Element.create("td", "Elsie", klass="sister")
+
+    assert str(td) == '<td class="sister">Elsie</td>'
+
+
+def test_create_invalid_name():
+    with pytest.raises(Exception, match="Could not create element 1"):
+        Element.create("1")
+
+
+def test_build():
+    ul = Element.build(
+        (
+            "ul",
+            {"klass": "sisters"},
+            [
+                ("li", None, "Elsie"),
+                ("li", {"hidden": True}, ["Lacie", ("br",)]),
+                ("li",),
+            ],
+        )
+    )
+
+    assert ul.parent is None
+    assert (
+        str(ul)
+        == '<ul class="sisters"><li>Elsie</li><li hidden="hidden">Lacie<br></li><li></li></ul>'
+    )
+
+
+def test_build_escapes_text():
+    assert str(Element.build(("p", None, "<b>"))) == "<p>&lt;b&gt;</p>"
+
+
+def test_build_with_element():
+    li = Element.create("li", "Tillie")
+    ul = Element.build(("ul", None, [li, ("li", None, "Elsie")]))
+
+    assert str(ul) == "<ul><li>Tillie</li><li>Elsie</li></ul>"
+
+
+def test_build_insert():
+    html = HTML("<table></table>")
+    table = html.root_element
+
+    table.insert(
+        Element.build(
+            ("tbody", None, [("tr", None, [("td", None, str(i))]) for i in range(3)])
+        )
+    )
+
+    assert (
+        str(html)
+        == "<table><tbody><tr><td>0</td></tr><tr><td>1</td></tr><tr><td>2</td></tr></tbody></table>"
+    )
+
+
+def test_build_invalid_children():
+    with pytest.raises(ValueError):
+        Element.build(("ul", None, 1))
+
+
+def test_append_is_created_in_same_document():
+    html = HTML("<ul><li>Elsie</li></ul>")
+    li = next(html.query("li"))
+
+    lacie = li.append("li", "Lacie")
+    lacie.text = "Tillie"
+
+    assert str(html) == "<ul><li>Elsie</li><li>Tillie</li></ul>"
+
+
+def test_inner_html():
+    html = HTML("<div><p>Elsie</p></div>")
+    div = html.root_element
+
+    assert div.inner_html == "<p>Elsie</p>"
+
+    div.inner_html = "<span>Lacie</span> and <b>Tillie</b>"
+
+    assert str(html) == "<div><span>Lacie</span> and <b>Tillie</b></div>"
+    assert [child.name for child in div.children] == ["span", "b"]
+
+
+def test_inner_html_context():
+    html = HTML("<table><tr><td>1</td></tr></table>")
+    tr = next(html.query("tr"))
+
+    tr.inner_html = "<td>2</td><td>3</td>"
+
+    assert str(html) == "<table><tbody><tr><td>2</td><td>3</td></tr></tbody></table>"
+
+
+def test_outer_html():
+    html = HTML('<ul><li>1</li><li id="elsie">2</li><li>3</li></ul>')
+    li = next(html.query("#elsie"))
+
+    assert li.outer_html == '<li id="elsie">2</li>'
+
+    li.outer_html = "<li>Lacie</li><li>Tillie</li>"
+
+    assert str(html) == "<ul><li>1</li><li>Lacie</li><li>Tillie</li><li>3</li></ul>"
+
+    # The replaced element is detached, but still intact
+    assert li.parent is None
+    assert str(li) == '<li id="elsie">2</li>'
+
+
+def test_outer_html_context():
+    html = HTML("<table><tr><td>1</td></tr></table>")
+    td = next(html.query("td"))
+
+    td.outer_html = "<td>2</td><td>3</td>"
+
+    assert str(html) == "<table><tbody><tr><td>2</td><td>3</td></tr></tbody></table>"
+
+
+def test_outer_html_empty():
+    html = HTML("<div><span>Elsie</span>Lacie</div>")
+
+    next(html.query("span")).outer_html = ""
+
+    assert str(html) == "<div>Lacie</div>"
+
+
+def test_outer_html_detached():
+    span = Element.create("span")
+
+    with pytest.raises(Exception, match="Element does not have a parent element"):
+        span.outer_html = "<b></b>"
+
+
+def test_outer_html_template():
+    html = HTML("<div><span>Elsie</span></div>")
+
+    html.query_first("span").outer_html = "<template><p>in</p></template>"
+
+    assert str(html) == "<div><template><p>in</p></template></div>"
+
+
+def test_outer_html_svg():
+    html = HTML("<div><span>Elsie</span></div>")
+
+    html.query_first("span").replace_with('<svg><clipPath id="c"></clipPath></svg>')
+
+    assert str(html) == '<div><svg><clipPath id="c"></clipPath></svg></div>'
+
+
+def test_replace_with_html():
+    html = HTML("<div><span>Elsie</span></div>")
+
+    next(html.query("span")).replace_with("<b>Lacie</b>")
+
+    assert str(html) == "<div><b>Lacie</b></div>"
+
+
+def test_replace_with_element():
+    html = HTML("<div><span>Elsie</span></div>")
+    span = next(html.query("span"))
+
+    span.replace_with(Element.build(("b", None, "Lacie")))
+
+    assert str(html) == "<div><b>Lacie</b></div>"
+    assert str(span) == "<span>Elsie</span>"
+
+
+def test_adopt():
+    page = HTML("<ul><li>Elsie</li></ul>")
+    other = HTML("<ol><li>Lacie</li></ol>")
+    ul = page.root_element
+    lacie = next(other.query("li"))
+
+    adopted = ul.adopt(lacie)
+
+    assert str(page) == "<ul><li>Elsie</li><li>Lacie</li></ul>"
+    assert adopted.parent == ul
+    assert str(other) == "<ol><li>Lacie</li></ol>"
+
+
+def test_adopt_template():
+    page = HTML("<main></main>")
+    other = HTML("<div><template><p>x</p></template></div>")
+
+    adopted = page.root_element.adopt(other.root_element)
+
+    assert str(page) == "<main><div><template><p>x</p></template></div></main>"
+    assert adopted.parent == page.root_element
+
+
+def test_adopt_template_itself():
+    page = HTML("<main><p>Elsie</p></main>")
+    other = HTML("<template><svg><clipPath></clipPath></svg></template>")
+
+    adopted = page.root_element.adopt(other.query_first("template"))
+
+    assert adopted.name == "template"
+    assert str(adopted) == "<template><svg><clipPath></clipPath></svg></template>"
+    assert str(page) == (
+        "<main><p>Elsie</p><template><svg><clipPath></clipPath></svg></template></main>"
+    )
+
+
+def test_replace_with_element_template():
+    html = HTML("<main><span>Dormouse</span></main>")
+
+    html.query_first("span").replace_with(
+        HTML("<div><template><p>x</p></template></div>").root_element
+    )
+
+    assert str(html) == "<main><div><template><p>x</p></template></div></main>"
+
+
+def test_build_with_template_element():
+    template = HTML("<template><p>x</p></template>").query_first("template")
+
+    assert str(Element.build(("div", None, template))) == (
+        "<div><template><p>x</p></template></div>"
+    )
+
+
+def test_adopt_move():
+    page = HTML("<ul><li>Elsie</li></ul>")
+    other = HTML("<ol><li>Lacie</li><li>Tillie</li></ol>")
+    lacie = next(other.query("li"))
+
+    page.root_element.adopt(lacie, move=True)
+
+    assert str(page) == "<ul><li>Elsie</li><li>Lacie</li></ul>"
+    assert str(other) == "<ol><li>Tillie</li></ol>"
+
+    # The moved element is detached, but still intact
+    assert lacie.parent is None
+    assert str(lacie) == "<li>Lacie</li>"
+
+
+NESTED = """<div id="outer" class="box">
+<div id="inner" class="box"><p class="note"><span>Dormouse</span></p></div>
+<p>Elsie</p>
+</div>"""
+
+
+def test_query():
+    html = HTML(NESTED)
+    outer = html.query_first("#outer")
+    inner = html.query_first("#inner")
+
+    assert [e.id for e in outer.query("div.box")] == ["inner"]
+    assert [e.name for e in inner.query("*")] == ["p", "span"]
+    assert [e.text for e in outer.query("p:not(.note)")] == ["Elsie"]
+    assert list(inner.query("div")) == []
+
+
+def test_query_context_outside_element():
+    html = HTML(NESTED)
+    p = html.query_first("p.note")
+
+    # Selectors match against the whole document, like `querySelectorAll`
+    assert [e.name for e in p.query("#outer span")] == ["span"]
+
+
+def test_query_first():
+    html = HTML(NESTED)
+    outer = html.query_first("#outer")
+
+    assert outer.query_first(".box").id == "inner"
+    assert outer.query_first("p").classes == ["note"]
+    assert outer.query_first("table") is None
+    assert html.query_first("span").query_first("span") is None
+
+
+def test_matches():
+    html = HTML(NESTED)
+    span = html.query_first("span")
+
+    assert span.matches("span")
+    assert span.matches("#inner p > span")
+    assert not span.matches("p")
+    assert not html.query_first("#outer").matches("span")
+    assert Element.create("a", href="/elsie").matches("a[href]")
+
+
+def test_matches_tag():
+    html = HTML('<svg><clipPath id="c"></clipPath></svg>')
+    clip_path = html.query_first("#c")
+
+    assert clip_path.matches("clipPath")
+    assert clip_path.matches("CLIPPATH")
+    assert clip_path.matches("*")
+    assert not clip_path.matches("svg")
+
+
+def test_closest():
+    html = HTML(NESTED)
+    span = html.query_first("span")
+
+    assert span.closest("span") == span
+    assert span.closest("p").classes == ["note"]
+    assert span.closest(".box").id == "inner"
+    assert span.closest("#outer").id == "outer"
+    assert span.closest("table") is None
+
+
+def test_closest_cache_elements():
+    html = HTML(NESTED, cache_elements=True)
+
+    assert html.query_first("span").closest("div") is html.query_first("#inner")
+
+
+def test_closest_detached():
+    div = Element.build(("div", {"class": "box"}, [("p", None, [("span", None, "x")])]))
+    span = div.query_first("span")
+
+    assert span.closest(".box") == div
+    assert span.closest("div > p").name == "p"
+    assert span.closest("section") is None
+
+
+def test_walk():
+    html = HTML(NESTED)
+    inner = html.query_first("#inner")
+
+    assert [
+        (event, node.name if isinstance(node, Element) else str(node))
+        for event, node in inner.walk()
+    ] == [
+        ("start", "div"),
+        ("start", "p"),
+        ("start", "span"),
+        ("text", "Dormouse"),
+        ("end", "span"),
+        ("end", "p"),
+        ("end", "div"),
+    ]
@@ -81,3 +81,386 @@ def test_html_encoding():
     html = HTML(b"<h1>\xed\xe5\xec\xf9</h1>", encoding="iso-8859-8")  # noqa: F405
     assert "<h1>םולש</h1>" in str(html)
     assert html.encoding == "iso-8859-8"
+
+
+@pytest.mark.parametrize(
+    "fixture", ["html_doc", "html_fragment", "html_unicorn_fragment"]
+)
+def test_html_iter_html(fixture, request):
+    html = request.getfixturevalue(fixture)
+
+    assert "".join(html.iter_html()) == str(html)
+
+
+@pytest.mark.parametrize("name", ["github", "wikipedia", "twitter"])
+def test_html_iter_html_samples(name):
+    with open(f"tests/html/samples/{name}.html") as f:
+        html = HTML(f.read())  # noqa: F405
+
+    assert "".join(html.iter_html()) == str(html)
+
+
+def test_html_write_to(html_doc):
+    import io
+
+    fp = io.StringIO()
+    html_doc.write_to(fp)
+
+    assert fp.getvalue() == str(html_doc)
+
+
+def test_element_write_to(html_doc):
+    import io
+
+    ul = next(html_doc.query("ul"))
+    fp = io.StringIO()
+    ul.write_to(fp)
+
+    assert fp.getvalue() == str(ul)
+    assert "".join(ul.iter_html()) == str(ul)
+
+
+def test_html_lazy():
+    html = HTML("<span>Dormouse", lazy=True)  # noqa: F405
+
+    assert not html.is_parsed
+    assert html._input_is_fragment
+    assert str(html) == "<span>Dormouse"
+    assert "".join(html.iter_html()) == "<span>Dormouse"
+    assert not html.is_parsed
+
+    assert html.root_element.name == "span"
+    assert html.is_parsed
+    assert str(html) == "<span>Dormouse</span>"
+
+
+def test_html_lazy_mutation():
+    html = HTML("<span>Dormouse</span>", lazy=True)  # noqa: F405
+
+    html.root_element.text = "Elsie"
+
+    assert str(html) == "<span>Elsie</span>"
+
+
+def test_html_not_lazy():
+    html = HTML("<span>Dormouse")  # noqa: F405
+
+    assert html.is_parsed
+    assert str(html) == "<span>Dormouse</span>"
+
+
+def test_html_copy_lazy():
+    html = HTML(HTML("<span>Dormouse</span>", lazy=True))  # noqa: F405
+
+    assert not html.is_parsed
+    assert html.root_element.name == "span"
+
+
+def test_html_bytes_utf8():
+    html = HTML("<h1>Dormouse ☕</h1>".encode())  # noqa: F405
+
+    assert html.encoding == "utf-8"
+    assert isinstance(html._source, bytes)
+    assert html.html == "<h1>Dormouse ☕</h1>"
+    assert str(html) == "<h1>Dormouse ☕</h1>"
+
+
+def test_html_bytes_invalid_utf8():
+    html = HTML(b"<p>caf\xe9</p>")  # noqa: F405
+
+    assert html.encoding == "windows-1252"
+    assert html.html == "<p>café</p>"
+    assert str(html) == "<p>café</p>"
+    assert html.prettify() == "<p>café</p>\n"
+    assert html.to_bytes() == b"<p>caf\xe9</p>"
+    assert html.root_element.text == "café"
+    assert html.query_attr("p", "id") == [None]
+
+
+def test_html_bytes_invalid_utf8_declared():
+    html = HTML(b'<meta charset="utf-8"><p>caf\xe9</p>')  # noqa: F405
+
+    assert html.encoding == "utf-8"
+    assert str(html) == '<meta charset="utf-8"><p>caf\ufffd</p>'
+    assert html.query_text("p") == ["caf\ufffd"]
+
+
+def test_html_bytes_bom():
+    html = HTML(b"\xef\xbb\xbf<h1>Dormouse</h1>")  # noqa: F405
+
+    assert str(html) == "<h1>Dormouse</h1>"
+    assert html._input_is_fragment
+
+
+def test_html_bytes_meta_charset():
+    html = HTML(  # noqa: F405
+        b'<html><head><meta charset="iso-8859-8"></head><body><h1>\xed\xe5\xec\xf9</h1></body></html>'
+    )
+
+    assert html.encoding == "iso-8859-8"
+    assert "<h1>םולש</h1>" in str(html)
+
+
+def test_html_bytes_content_type():
+    html = HTML(  # noqa: F405
+        b"<h1>\xed\xe5\xec\xf9</h1>", encoding="text/html; charset=big5"
+    )
+
+    assert html.encoding == "big5"
+    assert str(html) == "<h1>翴檛</h1>"
+
+
+def test_html_to_bytes():
+    html = HTML(b"<h1>\xed\xe5\xec\xf9</h1>", encoding="iso-8859-8")  # noqa: F405
+
+    assert html.to_bytes() == b"<h1>\xed\xe5\xec\xf9</h1>"
+    assert html.to_bytes("utf-8") == "<h1>םולש</h1>".encode()
+    assert html.to_bytes("ascii") == b"<h1>&#1501;&#1493;&#1500;&#1513;</h1>"
+
+
+def test_html_to_bytes_lazy():
+    source = b"<h1>Dormouse"
+    html = HTML(source, lazy=True)  # noqa: F405
+
+    assert html.to_bytes() is source
+    assert html.root_element.name == "h1"
+    assert html.to_bytes() == b"<h1>Dormouse</h1>"
+
+
+def test_html_from_path(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_bytes(b'<meta charset="iso-8859-8"><h1>\xed\xe5\xec\xf9</h1>')
+
+    html = HTML.from_path(path)  # noqa: F405
+
+    assert html.encoding == "iso-8859-8"
+    assert html._source is None
+    assert next(html.query("h1")).text == "םולש"
+    assert "<h1>םולש</h1>" in html.html
+
+
+def test_html_from_path_empty(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_bytes(b"")
+
+    html = HTML.from_path(path)  # noqa: F405
+
+    assert str(html) == ""
+
+
+def test_html_from_file():
+    import io
+
+    html = HTML.from_file(io.BytesIO(b"<span>Dormouse"))  # noqa: F405
+
+    assert html._source is None
+    assert html.html == "<span>Dormouse</span>"
+    assert str(HTML(html)) == "<span>Dormouse</span>"  # noqa: F405
+
+
+def test_html_from_file_text():
+    import io
+
+    html = HTML.from_file(io.StringIO("<span>Dormouse"))  # noqa: F405
+
+    assert str(html) == "<span>Dormouse</span>"
+
+
+def test_html_keep_source_false():
+    html = HTML("<span>Dormouse", keep_source=False)  # noqa: F405
+
+    assert html._source is None
+    assert html.html == "<span>Dormouse</span>"
+
+    next(html.query("span")).text = "Elsie"
+
+    assert html.html == "<span>Elsie</span>"
+
+
+def test_html_keep_source_false_lazy():
+    html = HTML("<span>Dormouse", lazy=True, keep_source=False)  # noqa: F405
+
+    assert html.html == "<span>Dormouse"
+
+    assert html.root_element.name == "span"
+    assert html._source is None
+    assert html.html == "<span>Dormouse</span>"
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("<span>Dormouse", "<span>{}</span>"),
+        ("<!-- hi --><span>Dormouse", "<!-- hi --><span>{}</span>"),
+        (
+            "<!DOCTYPE html><html><body><span>Dormouse</span></body></html><!-- hi -->",
+            "<!DOCTYPE html><html><head></head><body><span>{}</span></body></html><!-- hi -->",
+        ),
+    ],
+)
+def test_html_copy_without_source(source, expected):
+    html = HTML(source, keep_source=False)  # noqa: F405
+    next(html.query("span")).text = "Elsie"
+
+    copy = HTML(html)  # noqa: F405
+
+    assert copy._source is None
+    assert str(copy) == expected.format("Elsie")
+
+    # The copy does not share the parsed tree
+    next(copy.query("span")).text = "Lacie"
+
+    assert str(html) == expected.format("Elsie")
+    assert str(copy) == expected.format("Lacie")
+
+
+def test_html_copy_without_source_template(tmp_path):
+    path = tmp_path / "index.html"
+    path.write_bytes(
+        b'<div><template id="row"><p>Elsie</p></template><svg><clipPath></clipPath></svg></div>'
+    )
+
+    html = HTML.from_path(path)  # noqa: F405
+    copy = HTML(html)  # noqa: F405
+
+    assert html._source is None
+    assert str(copy) == str(html)
+    assert str(copy) == (
+        '<div><template id="row"><p>Elsie</p></template><svg><clipPath></clipPath></svg></div>'
+    )
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "<span>Dormouse",
+        "<!-- hi --><span>Dormouse",
+        "<!DOCTYPE html><!-- a --><html><body><span>Dormouse</span></body></html><!-- b --><!-- c -->",
+    ],
+)
+def test_html_clone(source):
+    html = HTML(source)  # noqa: F405
+    next(html.query("span")).text = "Elsie"
+    expected = str(html)
+
+    clone = html.clone()
+
+    assert clone._source is None
+    assert str(clone) == expected
+    assert clone.html == expected
+    assert clone.root_element.name == html.root_element.name
+
+    # The clone does not share the parsed tree
+    next(clone.query("span")).text = "Lacie"
+
+    assert str(html) == expected
+    assert str(clone) == expected.replace("Elsie", "Lacie")
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "amazon",
+        "bbc",
+        "bing",
+        "bootstrap",
+        "coding-horror",
+        "github",
+        "google",
+        "hacker-news",
+        "ny-times",
+        "reddit",
+        "stack-overflow",
+        "twitter",
+        "wikipedia",
+    ],
+)
+def test_html_clone_samples(name):
+    with open(f"tests/html/samples/{name}.html") as f:
+        html = HTML(f.read())  # noqa: F405
+
+    assert str(html.clone()) == str(html)
+
+
+def test_html_clone_template():
+    html = HTML(  # noqa: F405
+        '<div><template id="row"><p>Elsie</p><template><b>Lacie</b></template></template></div>'
+    )
+
+    assert str(html.clone()) == str(html)
+
+
+def test_html_clone_svg():
+    html = HTML(  # noqa: F405
+        '<svg><clipPath id="clip"><rect></rect></clipPath><foreignObject></foreignObject></svg>'
+    )
+
+    assert str(html.clone()) == str(html)
+
+
+def test_html_clone_lazy():
+    html = HTML("<span>Dormouse", lazy=True)  # noqa: F405
+    clone = html.clone()
+
+    assert clone.is_parsed is False
+    assert str(clone) == "<span>Dormouse"
+    assert html.is_parsed is False
+
+
+def test_html_clone_cache_elements():
+    html = HTML("<span>Dormouse", cache_elements=True)  # noqa: F405
+    span = html.root_element
+
+    clone = html.clone()
+    clone_span = clone.root_element
+
+    assert clone_span is not span
+    assert clone.root_element is clone_span
+
+
+def test_html_replace_subtree_selector():
+    page = HTML(  # noqa: F405
+        '<main><div data-component="card"></div><p>Dormouse</p><div data-component="card"></div></main>'
+    )
+    card = HTML('<div class="card"><h2>Elsie</h2></div>')  # noqa: F405
+
+    elements = page.replace_subtree("[data-component=card]", card.root_element)
+
+    assert str(page) == (
+        '<main><div class="card"><h2>Elsie</h2></div><p>Dormouse</p><div class="card"><h2>Elsie</h2></div></main>'
+    )
+    assert [element.name for element in elements] == ["div", "div"]
+
+    # The new elements are copies in the page
+    elements[0].text = "Lacie"
+
+    assert next(page.query(".card")).text == "Lacie"
+    assert str(card) == '<div class="card"><h2>Elsie</h2></div>'
+
+
+def test_html_replace_subtree_element():
+    page = HTML("<main><span>Dormouse</span></main>")  # noqa: F405
+    span = next(page.query("span"))
+
+    page.replace_subtree(span, HTML("<b>Tillie</b>").root_element)  # noqa: F405
+
+    assert str(page) == "<main><b>Tillie</b></main>"
+    assert span.parent is None
+
+
+def test_html_replace_subtree_template():
+    page = HTML("<main><span>Elsie</span><span>Lacie</span></main>")  # noqa: F405
+    source = HTML("<template><p>x</p></template>").query_first("template")  # noqa: F405
+
+    replaced = page.replace_subtree("span", source)
+
+    assert [element.name for element in replaced] == ["template", "template"]
+    assert str(page) == (
+        "<main><template><p>x</p></template><template><p>x</p></template></main>"
+    )
+
+
+def test_html_replace_subtree_no_matches():
+    page = HTML("<main></main>")  # noqa: F405
+
+    assert page.replace_subtree("span", HTML("<b></b>").root_element) == []  # noqa: F405
@@ -0,0 +1,128 @@
+from minestrone import HTML, Index
+
+NAV = """<ul id="nav" class="menu">
+<li class="item active"><a href="/">Home</a></li>
+<li class="item item"><a id="about" href="/about">About</a></li>
+<li class="item"><a id="about" href="/team">Team</a></li>
+</ul>"""
+
+
+def test_index():
+    html = HTML(NAV)
+    index = html.index()
+
+    assert isinstance(index, Index)
+    assert html.index() is index
+
+
+def test_get_by_id():
+    index = HTML(NAV).index()
+
+    assert index.get_by_id("nav").name == "ul"
+    assert index.get_by_id("about").get_attribute("href") == "/about"
+    assert index.get_by_id("missing") is None
+
+
+def test_get_by_tag():
+    index = HTML(NAV).index()
+
+    assert [a.text for a in index.get_by_tag("a")] == ["Home", "About", "Team"]
+    assert len(index.get_by_tag("LI")) == 3
+    assert index.get_by_tag("span") == []
+
+
+def test_get_by_tag_fragment():
+    index = HTML(NAV).index()
+
+    assert index.get_by_tag("html") == []
+    assert index.get_by_tag("body") == []
+
+
+def test_get_by_tag_document():
+    index = HTML("<html><head></head><body><p>Hi</p></body></html>").index()
+
+    assert len(index.get_by_tag("html")) == 1
+    assert len(index.get_by_tag("p")) == 1
+
+
+def test_get_by_tag_svg():
+    html = HTML('<svg><clipPath id="c"></clipPath></svg>')
+    index = html.index()
+
+    assert [e.id for e in index.get_by_tag("clipPath")] == ["c"]
+    assert [e.id for e in index.get_by_tag("clippath")] == ["c"]
+    assert len(index.get_by_tag("clipPath")) == html.count("clipPath")
+
+
+def test_get_by_class():
+    index = HTML(NAV).index()
+
+    assert len(index.get_by_class("item")) == 3
+    assert [li.name for li in index.get_by_class("active")] == ["li"]
+    assert index.get_by_class("missing") == []
+
+
+def test_index_after_setting_attribute():
+    html = HTML(NAV)
+    index = html.index()
+
+    assert index.get_by_id("home") is None
+
+    html.query_to_list("li")[0].id = "home"
+
+    assert index.get_by_id("home").name == "li"
+
+
+def test_index_after_adding_element():
+    html = HTML(NAV)
+    index = html.index()
+    ul = index.get_by_id("nav")
+
+    assert len(index.get_by_tag("li")) == 3
+
+    ul.append("li", "Contact", klass="item")
+
+    assert len(index.get_by_tag("li")) == 4
+    assert len(index.get_by_class("item")) == 4
+
+
+def test_index_after_removing_elements():
+    html = HTML(NAV)
+    index = html.index()
+
+    assert len(index.get_by_tag("a")) == 3
+
+    html.select("a").remove()
+
+    assert index.get_by_tag("a") == []
+    assert index.get_by_id("about") is None
+
+
+def test_index_after_replacing_html():
+    html = HTML(NAV)
+    index = html.index()
+
+    index.get_by_id("nav").inner_html = '<li id="only">Only</li>'
+
+    assert index.get_by_id("only").text == "Only"
+    assert len(index.get_by_tag("li")) == 1
+
+
+def test_index_of_clone():
+    html = HTML(NAV)
+    index = html.index()
+    clone = html.clone()
+
+    assert clone.index() is not index
+
+    clone.index().get_by_id("nav").id = "menu"
+
+    assert index.get_by_id("nav") is not None
+    assert clone.index().get_by_id("nav") is None
+
+
+def test_index_cache_elements():
+    html = HTML(NAV, cache_elements=True)
+    index = html.index()
+
+    assert index.get_by_id("nav") is html.query_to_list("ul")[0]
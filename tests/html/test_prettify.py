@@ -509,3 +509,64 @@ def test_html_prettify_samples(name):
     #         f.write(actual)
 
     eq(actual, expected)
+
+
+def test_html_prettify_many_siblings():
+    html = HTML("<ul>" + "<li>Dormouse</li>" * 10_000 + "</ul>")
+
+    actual = html.prettify()
+
+    assert actual.startswith("<ul>\n  <li>Dormouse</li>\n  <li>Dormouse</li>\n")
+    assert actual.endswith("  <li>Dormouse</li>\n</ul>\n")
+    assert actual.count("<li>") == 10_000
+
+
+def test_html_prettify_deep_nesting():
+    html = HTML("<div>" * 10_000 + "Dormouse" + "</div>" * 10_000)
+
+    actual = html.prettify(indent=0)
+
+    assert actual == "<div>\n" * 9_999 + "<div>Dormouse</div>\n" + "</div>\n" * 9_999
+
+
+def test_element_prettify_deep_nesting_indent():
+    html = HTML("<div>" * 3 + "Dormouse" + "</div>" * 3)
+
+    expected = """<div>
+  <div>
+    <div>Dormouse</div>
+  </div>
+</div>
+"""
+    actual = html.root_element.prettify()
+
+    eq(actual, expected)
+
+
+def test_html_write_pretty(html_doc):
+    import io
+
+    fp = io.StringIO()
+    html_doc.write_pretty(fp, indent=4)
+
+    assert fp.getvalue() == html_doc.prettify(indent=4)
+    assert "".join(html_doc.iter_pretty(indent=4)) == html_doc.prettify(indent=4)
+
+
+def test_html_iter_pretty_chunks():
+    html = HTML("<ul>" + "<li>Dormouse</li>" * 2_000 + "</ul>")
+
+    chunks = list(html.iter_pretty())
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == html.prettify()
+
+
+def test_element_write_pretty(html_doc):
+    import io
+
+    ul = next(html_doc.query("ul"))
+    fp = io.StringIO()
+    ul.write_pretty(fp)
+
+    assert fp.getvalue() == ul.prettify()
@@ -62,3 +62,187 @@ def test_query_css_selector(html_doc):
             == '<a href="https://dormouse.com/elsie" class="sister" id="elsie">Elsie</a>'
         )
         break
+
+
+def test_query_cache_elements(html_doc_str):
+    from minestrone import HTML
+
+    html = HTML(html_doc_str, cache_elements=True)
+
+    tillie = next(html.query("a#tillie"))
+
+    assert next(html.query("a#tillie")) is tillie
+    assert tillie in list(tillie.parent.children)
+    assert [e for e in html.elements if e.id == "tillie"][0] is tillie
+    assert next(tillie.parent.children).parent is tillie.parent
+
+
+def test_query_cache_elements_copy(html_doc_str):
+    from minestrone import HTML
+
+    html = HTML(HTML(html_doc_str, cache_elements=True))
+
+    assert html.root_element is html.root_element
+
+
+def test_query_attribute_prefix(html_unicorn_fragment):
+    actual = [
+        (element.name, name, value)
+        for element, name, value in html_unicorn_fragment.query_attribute_prefix(
+            "u:model"
+        )
+    ]
+
+    assert actual == [
+        ("input", "u:model.defer", "address"),
+        ("input", "u:model.lazy", "city"),
+        ("input", "u:model", "state"),
+        ("input", "u:model", "zip_code"),
+    ]
+
+
+def test_query_attribute_prefix_tuple():
+    from minestrone import HTML
+
+    html = HTML(
+        """<div u:model="name" unicorn:model.defer="email">
+<!-- u:model="comment" -->
+<input u:model>
+</div>"""
+    )
+
+    actual = [
+        (element.name, name, value)
+        for element, name, value in html.query_attribute_prefix(
+            ("unicorn:model", "u:model")
+        )
+    ]
+
+    assert actual == [
+        ("div", "u:model", "name"),
+        ("div", "unicorn:model.defer", "email"),
+        ("input", "u:model", None),
+    ]
+
+
+def test_query_attribute_prefix_same_element():
+    from minestrone import HTML
+
+    html = HTML('<div u:model="name" u:model.lazy="email"></div>')
+
+    (first, _, _), (second, _, _) = html.query_attribute_prefix("u:model")
+
+    assert first is second
+
+
+def test_query_limit(html_doc):
+    assert [a.id for a in html_doc.query("a", limit=2)] == ["elsie", "lacie"]
+    assert [a.id for a in html_doc.query("a.sister", limit=1)] == ["elsie"]
+    assert len(list(html_doc.query("a", limit=10))) == 3
+    assert list(html_doc.query("a", limit=0)) == []
+    assert list(html_doc.query("span", limit=1)) == []
+
+
+def test_query_limit_negative(html_doc):
+    with pytest.raises(ValueError):
+        html_doc.query("a", limit=-1)
+
+
+def test_query_first(html_doc):
+    assert html_doc.query_first("a").id == "elsie"
+    assert html_doc.query_first("ul li a#tillie").id == "tillie"
+    assert html_doc.query_first("span") is None
+
+
+def test_query_first_cache_elements(html_doc_str):
+    from minestrone import HTML
+
+    html = HTML(html_doc_str, cache_elements=True)
+
+    assert html.query_first("a") is next(html.query("a"))
+
+
+def test_exists(html_doc):
+    assert html_doc.exists("a.sister") is True
+    assert html_doc.exists("a[href$=tillie]") is True
+    assert html_doc.exists("span") is False
+
+
+def test_count(html_doc):
+    assert html_doc.count("a") == 3
+    assert html_doc.count("a#lacie") == 1
+    assert html_doc.count("span") == 0
+
+
+def test_query_attr(html_doc):
+    assert html_doc.query_attr("a", "id") == ["elsie", "lacie", "tillie"]
+    assert html_doc.query_attr("li", "id") == [None, None, None]
+    assert html_doc.query_attr("span", "id") == []
+
+
+def test_query_text(html_doc):
+    assert html_doc.query_text("a.sister") == ["Elsie", "Lacie", "Tillie"]
+    assert html_doc.query_text("h1") == ["The Dormouse's story"]
+
+
+def test_query_text_strip():
+    from minestrone import HTML
+
+    html = HTML("<p>  Elsie </p><p>\nLacie</p>")
+
+    assert html.query_text("p") == ["  Elsie ", "\nLacie"]
+    assert html.query_text("p", strip=True) == ["Elsie", "Lacie"]
+
+
+def test_query_values(html_doc):
+    assert html_doc.query_values("a", ["id", "#text", "title"]) == [
+        ("elsie", "Elsie", None),
+        ("lacie", "Lacie", None),
+        ("tillie", "Tillie", None),
+    ]
+    assert html_doc.query_values("a#lacie", ("href",)) == [
+        ("https://dormouse.com/lacie",)
+    ]
+    assert html_doc.query_values("a", []) == [(), (), ()]
+
+
+def test_query_many(html_doc):
+    from minestrone import ElementSet
+
+    actual = html_doc.query_many(
+        {"links": "a[href]", "items": "li", "title": "TITLE", "missing": "span"}
+    )
+
+    assert list(actual) == ["links", "items", "title", "missing"]
+    assert all(isinstance(elements, ElementSet) for elements in actual.values())
+    assert [a.id for a in actual["links"]] == ["elsie", "lacie", "tillie"]
+    assert len(actual["items"]) == 3
+    assert actual["title"].texts() == ["The Dormouse's story"]
+    assert len(actual["missing"]) == 0
+
+
+def test_query_many_document_order():
+    from minestrone import HTML
+
+    html = HTML("<p>1</p><div>2</div><p>3</p><div><p>4</p></div>")
+
+    actual = html.query_many({"p": "p", "div": "div", "nested": "div p"})
+
+    assert actual["p"].texts() == ["1", "3", "4"]
+    assert actual["div"].texts() == ["2", "4"]
+    assert actual["nested"].texts() == ["4"]
+
+
+def test_query_many_same_selector(html_doc):
+    from minestrone import compile
+
+    actual = html_doc.query_many(
+        {"a": "a", "links": compile("a"), "sisters": ".sister", "all": "*"}
+    )
+
+    assert len(actual["a"]) == len(actual["links"]) == len(actual["sisters"]) == 3
+    assert len(actual["all"]) == len(list(html_doc.query("*")))
+
+
+def test_query_many_empty(html_doc):
+    assert html_doc.query_many({}) == {}
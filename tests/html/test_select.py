@@ -0,0 +1,106 @@
+import pytest
+
+from minestrone import HTML, Element, ElementSet
+
+LINKS = """<div>
+<a href="/elsie" target="_blank" class="sister">Elsie</a>
+<a href="/lacie">Lacie</a>
+<a href="/tillie" target="_blank">Tillie</a>
+</div>"""
+
+
+def test_select():
+    html = HTML(LINKS)
+    links = html.select("a")
+
+    assert isinstance(links, ElementSet)
+    assert len(links) == 3
+    assert bool(links) is True
+    assert bool(html.select("span")) is False
+    assert [element.id for element in links] == [None, None, None]
+    assert isinstance(links[0], Element)
+    assert links[-1].text == "Tillie"
+
+
+def test_select_set_attr():
+    html = HTML(LINKS)
+
+    html.select("a[target=_blank]").set_attr("rel", ["noopener", "noreferrer"])
+
+    assert [a.get_attribute("rel") for a in html.query("a")] == [
+        "noopener noreferrer",
+        None,
+        "noopener noreferrer",
+    ]
+
+
+def test_select_remove_attr():
+    html = HTML(LINKS)
+
+    html.select("a").remove_attr("target")
+
+    assert "target" not in str(html)
+
+
+def test_select_add_class():
+    html = HTML(LINKS)
+
+    html.select("a[target=_blank]").add_class("external", "sister")
+
+    assert [a.classes for a in html.query("a")] == [
+        ["sister", "external"],
+        [],
+        ["external", "sister"],
+    ]
+
+
+def test_select_chaining():
+    html = HTML(LINKS)
+
+    html.select("a").add_class("link").set_attr("hidden", True).remove_attr("href")
+
+    assert next(html.query("a")).attributes == {
+        "target": "_blank",
+        "class": "sister link",
+        "hidden": "hidden",
+    }
+
+
+def test_select_remove():
+    html = HTML("<div><script>1</script><p>Elsie</p><script>2</script></div>")
+    scripts = html.select("script")
+
+    scripts.remove()
+
+    assert str(html) == "<div><p>Elsie</p></div>"
+    assert len(scripts) == 0
+
+
+def test_select_remove_nested():
+    html = HTML("<div><section><section>Elsie</section></section><p>Lacie</p></div>")
+
+    html.select("section").remove()
+
+    assert str(html) == "<div><p>Lacie</p></div>"
+
+
+def test_select_unwrap():
+    html = HTML("<p><b>Elsie</b> and <b>Lacie<b>!</b></b><b></b></p>")
+
+    html.select("b").unwrap()
+
+    assert str(html) == "<p>Elsie and Lacie!</p>"
+
+
+def test_select_texts():
+    html = HTML(LINKS)
+
+    assert html.select("a").texts() == ["Elsie", "Lacie", "Tillie"]
+    assert HTML("<p> Elsie </p>").select("p").texts(strip=True) == ["Elsie"]
+
+
+def test_select_invalid_attribute():
+    html = HTML(LINKS)
+
+    with pytest.raises(ValueError):
+        html.select("a").set_attr("data-count", 1)
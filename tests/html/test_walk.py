@@ -0,0 +1,115 @@
+from minestrone import HTML, Element, Text, Walker
+
+
+def _events(walker):
+    return [
+        (event, node.name if isinstance(node, Element) else str(node))
+        for event, node in walker
+    ]
+
+
+def test_walk():
+    html = HTML("<p>Elsie <b>and</b> Lacie</p><hr>")
+    walker = html.walk()
+
+    assert isinstance(walker, Walker)
+    assert _events(walker) == [
+        ("start", "p"),
+        ("text", "Elsie "),
+        ("start", "b"),
+        ("text", "and"),
+        ("end", "b"),
+        ("text", " Lacie"),
+        ("end", "p"),
+        ("start", "hr"),
+        ("end", "hr"),
+    ]
+
+
+def test_walk_document():
+    html = HTML(
+        "<html><head><title>Dormouse</title></head><body><p>Elsie</p></body></html>"
+    )
+
+    assert _events(html.walk()) == [
+        ("start", "html"),
+        ("start", "head"),
+        ("start", "title"),
+        ("text", "Dormouse"),
+        ("end", "title"),
+        ("end", "head"),
+        ("start", "body"),
+        ("start", "p"),
+        ("text", "Elsie"),
+        ("end", "p"),
+        ("end", "body"),
+        ("end", "html"),
+    ]
+
+
+def test_walk_node_types():
+    html = HTML("<p>Elsie</p>")
+
+    assert [type(node) for _, node in html.walk()] == [Element, Text, Element]
+
+
+def test_walk_skip():
+    html = HTML("<nav><a>Home</a><a>About</a></nav><main><p>Elsie</p></main>")
+    walker = html.walk()
+    events = []
+
+    for event, node in walker:
+        if isinstance(node, Element):
+            events.append((event, node.name))
+
+            if event == "start" and node.name == "nav":
+                walker.skip()
+
+    assert events == [
+        ("start", "nav"),
+        ("end", "nav"),
+        ("start", "main"),
+        ("start", "p"),
+        ("end", "p"),
+        ("end", "main"),
+    ]
+
+
+def test_walk_skip_after_text():
+    html = HTML("<div>Elsie<p>Lacie</p></div>")
+    walker = html.walk()
+    events = []
+
+    for event, node in walker:
+        if event == "text":
+            walker.skip()
+
+        events.append(event)
+
+    assert events == ["start", "text", "start", "text", "end", "end"]
+
+
+def test_walk_stop():
+    html = HTML("<p>Elsie</p><p>Lacie</p><p>Tillie</p>")
+    names = []
+
+    for event, node in html.walk():
+        if event == "start":
+            names.append(node.text)
+
+            if node.text == "Lacie":
+                break
+
+    assert names == ["Elsie", "Lacie"]
+
+
+def test_walk_empty():
+    assert _events(HTML("").walk()) == []
+
+
+def test_walk_cache_elements():
+    html = HTML("<p>Elsie</p>", cache_elements=True)
+    (_, start), _, (_, end) = list(html.walk())
+
+    assert start is end
+    assert start is html.query_first("p")
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from minestrone import HTML
+from minestrone.batch import map_documents
+
+
+def _h1_text(html: HTML) -> str:
+    return next(html.query("h1")).text
+
+
+def test_map_documents():
+    sources = [f"<h1>{i}</h1>" for i in range(50)]
+
+    actual = list(map_documents(_h1_text, sources, max_workers=2, chunksize=4))
+
+    assert actual == [str(i) for i in range(50)]
+
+
+def test_map_documents_unordered():
+    sources = [f"<h1>{i}</h1>" for i in range(50)]
+
+    actual = list(
+        map_documents(_h1_text, sources, max_workers=2, chunksize=4, ordered=False)
+    )
+
+    assert sorted(actual, key=int) == [str(i) for i in range(50)]
+
+
+def test_map_documents_bytes_and_paths(tmp_path):
+    path = tmp_path / "dormouse.html"
+    path.write_bytes(b"<h1>Dormouse</h1>")
+
+    actual = list(map_documents(_h1_text, [b"<h1>Elsie</h1>", path], max_workers=1))
+
+    assert actual == ["Elsie", "Dormouse"]
+
+
+def test_map_documents_executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        actual = list(
+            map_documents(
+                lambda html: html.root_element.name,
+                ["<span></span>", "<div></div>"],
+                executor=executor,
+            )
+        )
+
+    assert actual == ["span", "div"]
+
+
+def test_map_documents_invalid_chunksize():
+    with pytest.raises(ValueError):
+        list(map_documents(_h1_text, ["<h1>Elsie</h1>"], chunksize=0))
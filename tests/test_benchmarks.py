@@ -1,8 +1,12 @@
 # Run this with `poe t tests/test_benchmarks.py --benchmark-only`
 import re
 from html.parser import HTMLParser
+from pathlib import Path
 from typing import Iterator
 
+import pytest
+
+import minestrone
 from minestrone import HTML, Element
 
 UNICORN_MODEL_REGEX = re.compile(
@@ -44,9 +48,9 @@ def test_regex(benchmark):
 
 
 def _minestrone_get_unicorn_models(element: Element) -> Iterator[str]:
-    for attribute in element.attributes.keys():
+    for attribute, value in element.attrs.items():
         if attribute.startswith("unicorn:model") or attribute.startswith("u:model"):
-            yield element.attributes[attribute]
+            yield value
 
 
 def test_minestrone(benchmark):
@@ -80,6 +84,36 @@ def test_minestrone_with_existing_html(benchmark):
     assert EXPECTED == actual
 
 
+def test_minestrone_query_attribute_prefix(benchmark):
+    def _():
+        minestrone_html = HTML(HTML_FRAGMENT)
+
+        return [
+            value
+            for _, _, value in minestrone_html.query_attribute_prefix(
+                ("unicorn:model", "u:model")
+            )
+        ]
+
+    actual = benchmark(_)
+    assert EXPECTED == actual
+
+
+def test_minestrone_query_attribute_prefix_with_existing_html(benchmark):
+    minestrone_html = HTML(HTML_FRAGMENT)
+
+    def _():
+        return [
+            value
+            for _, _, value in minestrone_html.query_attribute_prefix(
+                ("unicorn:model", "u:model")
+            )
+        ]
+
+    actual = benchmark(_)
+    assert EXPECTED == actual
+
+
 # def test_parsel(benchmark):
 #     from parsel import Selector
 
@@ -161,3 +195,516 @@ def test_html_parser(benchmark):
 
     actual = benchmark(_)
     assert EXPECTED == actual
+
+
+SAMPLES_DIRECTORY = Path("tests/html/samples")
+CORPUS_SELECTORS = ["div > a[href]", "a", "ul li a", "meta[name]", "script[src]"]
+
+
+def _corpus():
+    return [HTML(path.read_text()) for path in sorted(SAMPLES_DIRECTORY.glob("*.html"))]
+
+
+def test_query_uncached_selectors(benchmark):
+    corpus = _corpus()
+
+    def _():
+        count = 0
+
+        for html in corpus:
+            for selector in CORPUS_SELECTORS:
+                count += len(html._parser.css(selector))
+
+        return count
+
+    actual = benchmark(_)
+    assert actual > 0
+
+
+def test_query_cached_selectors(benchmark):
+    corpus = _corpus()
+    selectors = [minestrone.compile(selector) for selector in CORPUS_SELECTORS]
+
+    def _():
+        count = 0
+
+        for html in corpus:
+            for selector in selectors:
+                count += len(selector._select(html._parser))
+
+        return count
+
+    actual = benchmark(_)
+    assert actual > 0
+
+
+@pytest.mark.parametrize("count", [1_000, 10_000, 100_000])
+def test_prettify_siblings(benchmark, count):
+    html = HTML("<ul>" + "<li>Dormouse</li>" * count + "</ul>")
+
+    actual = benchmark(html.prettify)
+    assert actual.count("<li>") == count
+
+
+@pytest.mark.parametrize("depth", [100, 1_000, 10_000])
+def test_prettify_nesting(benchmark, depth):
+    html = HTML("<div>" * depth + "Dormouse" + "</div>" * depth)
+
+    actual = benchmark(html.prettify, indent=0)
+    assert actual.count("<div>") == depth
+
+
+def test_html_copy_constructor(benchmark):
+    corpus = _corpus()
+
+    def _():
+        return [HTML(html) for html in corpus]
+
+    actual = benchmark(_)
+    assert len(actual) == len(corpus)
+
+
+def test_html_clone(benchmark):
+    corpus = _corpus()
+
+    def _():
+        return [html.clone() for html in corpus]
+
+    actual = benchmark(_)
+    assert len(actual) == len(corpus)
+
+
+def test_render_by_parsing(benchmark):
+    def _():
+        return HTML(
+            HTML_FRAGMENT.replace("Step 2", "Dormouse").replace(
+                'unicorn:id="step2"', 'unicorn:id="dormouse"'
+            )
+        )
+
+    actual = benchmark(_)
+    assert "Dormouse" in str(actual)
+
+
+def test_render_template(benchmark):
+    template = minestrone.Template(
+        HTML_FRAGMENT,
+        slots={
+            "step": "div > div > div:first-child",
+            "id": "div > div",
+        },
+    )
+
+    def _():
+        return template.render(step="Dormouse", id={"unicorn:id": "dormouse"})
+
+    actual = benchmark(_)
+    assert "Dormouse" in str(actual)
+
+
+TABLE_ROWS = 10_000
+
+
+def test_build_table_by_parsing_each_element(benchmark):
+    def _():
+        tbody = HTML("<table><tbody></tbody></table>")._parser.css_first("tbody")
+
+        for i in range(TABLE_ROWS):
+            tr = HTML(f"<table><tr><td>{i}</td></tr></table>")._parser.css_first("tr")
+            tbody.insert_child(tr)
+
+        return tbody
+
+    actual = benchmark(_)
+    assert actual.html.count("<tr>") == TABLE_ROWS
+
+
+def test_build_table(benchmark):
+    def _():
+        return Element.build(
+            (
+                "tbody",
+                None,
+                [("tr", None, [("td", None, str(i))]) for i in range(TABLE_ROWS)],
+            )
+        )
+
+    actual = benchmark(_)
+    assert str(actual).count("<tr>") == TABLE_ROWS
+
+
+def _component_html() -> HTML:
+    return HTML(
+        "<main><section>"
+        + "<div><span>Dormouse</span></div>" * 1_000
+        + "</section></main>"
+    )
+
+
+def test_replace_subtree_by_node(benchmark):
+    def _():
+        section = next(_component_html().query("section"))
+        section.remove_children()
+
+        for _ in range(1_000):
+            section.insert(Element.create("p", "Elsie"), -1)
+
+        return section
+
+    actual = benchmark(_)
+    assert actual.outer_html.count("<p>") == 1_000
+
+
+def test_replace_subtree_by_inner_html(benchmark):
+    def _():
+        section = next(_component_html().query("section"))
+        section.inner_html = "<p>Elsie</p>" * 1_000
+
+        return section
+
+    actual = benchmark(_)
+    assert actual.outer_html.count("<p>") == 1_000
+
+
+def _page_and_components():
+    page = HTML("<main>" + '<div data-component="card"></div>' * 100 + "</main>")
+    components = [
+        HTML(f'<div class="card"><h2>Dormouse {i}</h2>{HTML_FRAGMENT}</div>')
+        for i in range(100)
+    ]
+
+    return ((page, components), {})
+
+
+def test_stitch_components_by_parsing(benchmark):
+    def _(page, components):
+        for placeholder, component in zip(
+            page.query_to_list("[data-component=card]"), components
+        ):
+            placeholder.replace_with(str(component))
+
+        return page
+
+    actual = benchmark.pedantic(_, setup=_page_and_components, rounds=100)
+    assert str(actual).count('class="card"') == 100
+
+
+def test_stitch_components_by_node(benchmark):
+    def _(page, components):
+        for placeholder, component in zip(
+            page.query_to_list("[data-component=card]"), components
+        ):
+            page.replace_subtree(placeholder, component.root_element)
+
+        return page
+
+    actual = benchmark.pedantic(_, setup=_page_and_components, rounds=100)
+    assert str(actual).count('class="card"') == 100
+
+
+BULK_LINKS = '<a href="/dormouse" target="_blank">Dormouse</a>' * 100_000
+
+
+def test_bulk_edit_with_loop(benchmark):
+    def _(html):
+        for element in html.query("a[target=_blank]"):
+            element.classes = element.classes + ["external"]
+            element.update_attributes(rel="noopener")
+
+        return html
+
+    actual = benchmark.pedantic(_, setup=lambda: ((HTML(BULK_LINKS),), {}), rounds=5)
+    assert str(actual).count('class="external"') == 100_000
+
+
+def test_bulk_edit_with_element_set(benchmark):
+    def _(html):
+        html.select("a[target=_blank]").add_class("external").set_attr(
+            "rel", "noopener"
+        )
+
+        return html
+
+    actual = benchmark.pedantic(_, setup=lambda: ((HTML(BULK_LINKS),), {}), rounds=5)
+    assert str(actual).count('class="external"') == 100_000
+
+
+REWRITE_RULES = [
+    "img[src]",
+    "script",
+    "a[href]",
+    "link[rel=stylesheet]",
+    "meta[name]",
+    "div.container",
+    "[onclick]",
+    "iframe",
+    "form input",
+    "source[srcset]",
+    "video",
+    "style",
+    "span.price",
+    "ul > li",
+    "a[target=_blank]",
+]
+
+
+def _rewrite_handler(element):
+    element.update_attributes(rewritten=True)
+
+
+def _wikipedia_html():
+    return ((HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text()),), {})
+
+
+def test_rewrite_with_query_per_rule(benchmark):
+    def _(html):
+        for selector in REWRITE_RULES:
+            for element in html.query(selector):
+                _rewrite_handler(element)
+
+        return html
+
+    actual = benchmark.pedantic(_, setup=_wikipedia_html, rounds=20)
+    assert str(actual).count('rewritten="rewritten"') > 0
+
+
+def test_rewrite_with_rewriter(benchmark):
+    rewriter = minestrone.Rewriter()
+
+    for selector in REWRITE_RULES:
+        rewriter.on(selector, _rewrite_handler)
+
+    def _(html):
+        return rewriter.rewrite(html)
+
+    actual = benchmark.pedantic(_, setup=_wikipedia_html, rounds=20)
+    assert str(actual).count('rewritten="rewritten"') > 0
+
+
+INDEX_LOOKUPS = ["mw-content-text", "p-search", "footer", "missing"]
+
+
+def test_lookup_with_query(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        return [
+            [html.query_to_list(f"#{id}") for id in INDEX_LOOKUPS],
+            html.query_to_list("a"),
+            html.query_to_list(".mw-editsection"),
+        ]
+
+    actual = benchmark(_)
+    assert len(actual[1]) > 0
+
+
+def test_lookup_with_index(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+    index = html.index()
+
+    def _():
+        return [
+            [index.get_by_id(id) for id in INDEX_LOOKUPS],
+            index.get_by_tag("a"),
+            index.get_by_class("mw-editsection"),
+        ]
+
+    actual = benchmark(_)
+    assert len(actual[1]) > 0
+
+
+EXISTS_SELECTORS = ["a[href]", "div.mw-parser-output", "img", "script[async]", "span"]
+
+
+def test_exists_with_query_to_list(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        return [bool(html.query_to_list(selector)) for selector in EXISTS_SELECTORS]
+
+    actual = benchmark(_)
+    assert any(actual)
+
+
+def test_exists(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        return [html.exists(selector) for selector in EXISTS_SELECTORS]
+
+    actual = benchmark(_)
+    assert any(actual)
+
+
+def _is_inside(element, ancestor):
+    parent = element.parent
+
+    while parent is not None:
+        if parent == ancestor:
+            return True
+
+        parent = parent.parent
+
+    return False
+
+
+def test_scoped_query_with_document_query(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+    navboxes = html.query_to_list("div.navbox")
+
+    def _():
+        links = html.query_to_list("a")
+
+        return [[a for a in links if _is_inside(a, navbox)] for navbox in navboxes]
+
+    actual = benchmark(_)
+    assert sum(len(links) for links in actual) > 0
+
+
+def test_scoped_query_with_element_query(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+    navboxes = html.query_to_list("div.navbox")
+
+    def _():
+        return [list(navbox.query("a")) for navbox in navboxes]
+
+    actual = benchmark(_)
+    assert sum(len(links) for links in actual) > 0
+
+
+def test_links_outside_navboxes_with_elements(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        navboxes = html.query_to_list("div.navbox")
+
+        return [
+            element
+            for element in html.elements
+            if element.name == "a"
+            and not any(_is_inside(element, navbox) for navbox in navboxes)
+        ]
+
+    actual = benchmark(_)
+    assert len(actual) > 0
+
+
+def test_links_outside_navboxes_with_walk(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        links = []
+        walker = html.walk()
+
+        for event, node in walker:
+            if event == "start":
+                if node.name == "a":
+                    links.append(node)
+                elif node.name == "div" and "navbox" in node.classes:
+                    walker.skip()
+
+        return links
+
+    actual = benchmark(_)
+    assert len(actual) > 0
+
+
+def test_tag_counts_with_elements(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        counts = {}
+
+        for element in html.elements:
+            counts[element.name] = counts.get(element.name, 0) + 1
+
+        return counts
+
+    actual = benchmark(_)
+    assert actual["a"] > 0
+
+
+def test_tag_counts_with_visit(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        counts = {}
+
+        def _count(view):
+            counts[view.tag] = counts.get(view.tag, 0) + 1
+
+        minestrone.visit(html, {"*": _count})
+
+        return counts
+
+    actual = benchmark(_)
+    assert actual["a"] > 0
+
+
+def test_link_values_with_elements(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        return [
+            (a.attributes.get("href"), a.attributes.get("title"))
+            for a in html.query("a[href]")
+        ]
+
+    actual = benchmark(_)
+    assert len(actual) > 0
+
+
+def test_link_values_with_query_values(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        return html.query_values("a[href]", ["href", "title"])
+
+    actual = benchmark(_)
+    assert len(actual) > 0
+
+
+PROFILE_SELECTORS = {
+    "links": "a[href]",
+    "images": "img[src]",
+    "scripts": "script",
+    "styles": "style",
+    "stylesheets": "link[rel=stylesheet]",
+    "meta": "meta[name]",
+    "headings": "h2",
+    "subheadings": "h3",
+    "paragraphs": "p",
+    "lists": "ul",
+    "list_items": "li",
+    "tables": "table",
+    "rows": "tr",
+    "cells": "td",
+    "divs": "div",
+    "spans": "span",
+    "forms": "form",
+    "inputs": "input",
+    "iframes": "iframe",
+    "external_links": "a[rel~=nofollow]",
+}
+
+
+def test_profile_with_query_per_selector(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        return {
+            name: html.select(selector) for name, selector in PROFILE_SELECTORS.items()
+        }
+
+    actual = benchmark(_)
+    assert len(actual["links"]) > 0
+
+
+def test_profile_with_query_many(benchmark):
+    html = HTML((SAMPLES_DIRECTORY / "wikipedia.html").read_text())
+
+    def _():
+        return html.query_many(PROFILE_SELECTORS)
+
+    actual = benchmark(_)
+    assert len(actual["links"]) > 0
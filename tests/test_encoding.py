@@ -0,0 +1,80 @@
+import codecs
+
+from minestrone.encoding import (
+    get_fallback_encoding,
+    is_utf8,
+    is_valid_utf8,
+    sniff_encoding,
+)
+
+
+def test_sniff_encoding_default():
+    assert sniff_encoding(b"<h1>Dormouse</h1>") == ("utf-8", 0)
+
+
+def test_sniff_encoding_bom():
+    assert sniff_encoding(codecs.BOM_UTF8 + b"<h1>Dormouse</h1>") == ("utf-8", 3)
+    assert sniff_encoding(codecs.BOM_UTF16_LE + "<h1>".encode("utf-16-le")) == (
+        "utf-16-le",
+        2,
+    )
+
+
+def test_sniff_encoding_bom_wins():
+    html = codecs.BOM_UTF8 + b"<h1>Dormouse</h1>"
+
+    assert sniff_encoding(html, "big5") == ("utf-8", 3)
+
+
+def test_sniff_encoding_argument():
+    assert sniff_encoding(b"<h1>Dormouse</h1>", "big5") == ("big5", 0)
+
+
+def test_sniff_encoding_content_type():
+    actual = sniff_encoding(b"<h1>Dormouse</h1>", "text/html; charset=ISO-8859-8")
+
+    assert actual == ("ISO-8859-8", 0)
+
+
+def test_sniff_encoding_meta_charset():
+    html = b'<html><head><meta charset="windows-1252"></head></html>'
+
+    assert sniff_encoding(html) == ("windows-1252", 0)
+
+
+def test_sniff_encoding_meta_http_equiv():
+    html = b'<meta http-equiv="Content-Type" content="text/html; charset=big5">'
+
+    assert sniff_encoding(html) == ("big5", 0)
+
+
+def test_sniff_encoding_meta_charset_after_first_kilobyte():
+    html = b"<!--" + b" " * 1024 + b'--><meta charset="big5">'
+
+    assert sniff_encoding(html) == ("utf-8", 0)
+
+
+def test_sniff_encoding_meta_charset_unknown():
+    assert sniff_encoding(b'<meta charset="dormouse">') == ("utf-8", 0)
+    assert sniff_encoding(b'<meta charset="utf-16">') == ("utf-8", 0)
+
+
+def test_is_utf8():
+    assert is_utf8("utf-8")
+    assert is_utf8("UTF8")
+    assert is_utf8("us-ascii")
+    assert not is_utf8("big5")
+    assert not is_utf8("dormouse")
+
+
+def test_is_valid_utf8():
+    assert is_valid_utf8(b"<h1>Dormouse</h1>")
+    assert is_valid_utf8("<h1>Dormouse ☕</h1>".encode())
+    assert not is_valid_utf8(b"<h1>caf\xe9</h1>")
+
+
+def test_get_fallback_encoding():
+    assert get_fallback_encoding(b"<h1>caf\xe9</h1>") == "windows-1252"
+    assert get_fallback_encoding(b"<h1>caf\xe9</h1>", "utf-8") == "utf-8"
+    assert get_fallback_encoding(codecs.BOM_UTF8 + b"<h1>caf\xe9</h1>") == "utf-8"
+    assert get_fallback_encoding(b'<meta charset="utf-8"><h1>caf\xe9</h1>') == "utf-8"
@@ -0,0 +1,121 @@
+from minestrone import HTML, Rewriter, Selector
+
+
+def _strip_event_handlers(element):
+    for name in [name for name in element.attrs if name.startswith("on")]:
+        del element.attrs[name]
+
+
+def test_rewrite():
+    rewriter = Rewriter()
+    rewriter.on(
+        "img[src]",
+        lambda img: img.update_attributes(src="https://cdn" + img.get_attribute("src")),
+    )
+    rewriter.on("script", lambda script: script.update_attributes(nonce="dormouse"))
+    rewriter.on("*", _strip_event_handlers)
+
+    html = HTML(
+        '<div onclick="go()"><img src="/elsie.png" onload="go()"><script></script></div>'
+    )
+
+    assert rewriter.rewrite(html) is html
+    assert str(html) == (
+        '<div><img src="https://cdn/elsie.png"><script nonce="dormouse"></script></div>'
+    )
+
+
+def test_rewrite_decorator():
+    rewriter = Rewriter()
+
+    @rewriter.on(Selector("a"))
+    def add_class(element):
+        element.classes = element.classes + ["sister"]
+
+    html = rewriter.rewrite(HTML("<a>Elsie</a><a>Lacie</a>"))
+
+    assert add_class.__name__ == "add_class"
+    assert str(html) == '<a class="sister">Elsie</a><a class="sister">Lacie</a>'
+
+
+def test_rewrite_chaining():
+    rewriter = (
+        Rewriter()
+        .on("a", lambda a: a.update_attributes(rel="noopener"))
+        .on("a", lambda a: a.update_attributes(target="_blank"))
+    )
+
+    html = rewriter.rewrite(HTML("<a>Elsie</a>"))
+
+    assert len(rewriter) == 2
+    assert str(html) == '<a rel="noopener" target="_blank">Elsie</a>'
+
+
+def test_rewrite_handler_order():
+    calls = []
+    rewriter = Rewriter()
+    rewriter.on("li", lambda li: calls.append(("li", li.text)))
+    rewriter.on("#lacie", lambda li: calls.append(("#lacie", li.text)))
+    rewriter.on("li", lambda li: calls.append(("li again", li.text)))
+
+    rewriter.rewrite(HTML('<ul><li>Elsie</li><li id="lacie">Lacie</li></ul>'))
+
+    assert calls == [
+        ("li", "Elsie"),
+        ("li", "Lacie"),
+        ("#lacie", "Lacie"),
+        ("li again", "Elsie"),
+        ("li again", "Lacie"),
+    ]
+
+
+def test_rewrite_matches_after_changes():
+    rewriter = Rewriter()
+    rewriter.on("li", lambda li: li.update_attributes(klass="sister"))
+    rewriter.on(".sister", lambda li: li.update_attributes(hidden=True))
+
+    html = rewriter.rewrite(HTML("<ul><li>Elsie</li></ul>"))
+
+    assert str(html) == '<ul><li class="sister" hidden="hidden">Elsie</li></ul>'
+
+
+def test_rewrite_replaced_elements():
+    calls = []
+
+    def _update(img):
+        calls.append(img.get_attribute("src"))
+        img.update_attributes(alt="Elsie")
+
+    rewriter = Rewriter()
+    rewriter.on(
+        "img", lambda img: img.replace_with('<picture><img src="/new.png"></picture>')
+    )
+    rewriter.on("img[src]", _update)
+
+    html = rewriter.rewrite(HTML('<p><img src="/elsie.png"></p>'))
+
+    assert str(html) == '<p><picture><img src="/new.png" alt="Elsie"></picture></p>'
+    assert calls == ["/new.png"]
+
+
+def test_rewrite_destroyed_elements():
+    calls = []
+
+    def _append(span):
+        for i in range(4):
+            span.append("p", f"fresh{i}")
+
+    rewriter = Rewriter()
+    rewriter.on("div", lambda div: setattr(div, "inner_html", ""))
+    rewriter.on("span", _append)
+    rewriter.on("p", lambda p: calls.append(p.text))
+
+    rewriter.rewrite(HTML("<div><p>1</p><p>2</p></div><span>s</span>"))
+
+    assert calls == ["fresh3", "fresh2", "fresh1", "fresh0"]
+
+
+def test_rewrite_without_rules():
+    html = HTML("<a>Elsie</a>")
+
+    assert str(Rewriter().rewrite(html)) == "<a>Elsie</a>"
@@ -0,0 +1,65 @@
+import pytest
+from selectolax.lexbor import SelectolaxError
+
+import minestrone
+from minestrone import HTML, Selector
+from minestrone.selector import _compile
+
+
+def test_compile():
+    selector = minestrone.compile(" ul li a.sister ")
+
+    assert isinstance(selector, Selector)
+    assert selector.pattern == "ul li a.sister"
+    assert str(selector) == "ul li a.sister"
+
+
+def test_compile_selector_is_returned():
+    selector = Selector("a")
+
+    assert minestrone.compile(selector) is selector
+
+
+def test_compile_is_cached():
+    _compile.cache_clear()
+
+    assert minestrone.compile("div > a[href]") is minestrone.compile("div > a[href]")
+    assert _compile.cache_info().hits == 1
+
+
+def test_selector_equality():
+    assert Selector("a") == Selector(" a")
+    assert hash(Selector("a")) == hash(Selector(" a"))
+    assert Selector("a") != Selector("span")
+
+
+def test_selector_invalid():
+    with pytest.raises(SelectolaxError):
+        Selector("div >>> ")
+
+
+def test_selector_empty():
+    with pytest.raises(ValueError):
+        Selector("  ")
+
+
+def test_query_with_selector(html_doc):
+    selector = minestrone.compile("a.sister")
+
+    assert [a.id for a in html_doc.query(selector)] == ["elsie", "lacie", "tillie"]
+    assert len(html_doc.query_to_list(selector)) == 3
+
+
+def test_query_with_tag_selector():
+    html = HTML("<div><A href='/'>Home</A><span></span><a>Away</a></div>")
+
+    assert [a.text for a in html.query(Selector("A"))] == ["Home", "Away"]
+    assert [e.name for e in html.query(Selector("*"))] == [
+        "html",
+        "head",
+        "body",
+        "div",
+        "a",
+        "span",
+        "a",
+    ]
@@ -0,0 +1,134 @@
+import pytest
+
+from minestrone import HTML, Selector, Template
+
+CARD = """<div class="card">
+<h2 data-slot="title">Title</h2>
+<a data-slot="link" href="#">Link</a>
+<p>Body</p>
+</div>"""
+
+
+def test_template_slots():
+    template = Template(CARD, slots={"body": "p"})
+
+    assert template.slots == ["title", "link", "body"]
+
+
+def test_template_removes_slot_attribute():
+    template = Template(CARD)
+
+    assert "data-slot" not in str(template)
+    assert "data-slot" not in str(template.render())
+
+
+def test_template_render_text():
+    template = Template(CARD)
+
+    html = template.render(title="The <Dormouse>")
+
+    assert isinstance(html, HTML)
+    assert next(html.query("h2")).text == "The <Dormouse>"
+    assert "<h2>The &lt;Dormouse&gt;</h2>" in str(html)
+
+
+def test_template_render_attributes():
+    template = Template(CARD)
+
+    html = template.render(link={"href": "/elsie", "klass": ["sister", "first"]})
+
+    assert '<a href="/elsie" class="sister first">Link</a>' in str(html)
+
+
+def test_template_render_remove_attributes():
+    template = Template(CARD)
+
+    html = template.render(link={"href": None})
+
+    assert "<a>Link</a>" in str(html)
+
+
+def test_template_render_selector_slots():
+    template = Template(CARD, slots={"body": Selector("p")})
+
+    html = template.render({"body": "Elsie"}, title="Lacie")
+
+    assert "<h2>Lacie</h2>" in str(html)
+    assert "<p>Elsie</p>" in str(html)
+
+
+def test_template_render_multiple_elements():
+    template = Template("<ul><li>1</li><li>2</li></ul>", slots={"item": "li"})
+
+    html = template.render(item="Tillie")
+
+    assert str(html) == "<ul><li>Tillie</li><li>Tillie</li></ul>"
+
+
+def test_template_render_is_independent():
+    template = Template(CARD)
+
+    first = template.render(title="Elsie")
+    second = template.render(title="Lacie")
+
+    assert "<h2>Elsie</h2>" in str(first)
+    assert "<h2>Lacie</h2>" in str(second)
+    assert "<h2>Title</h2>" in str(template)
+
+
+def test_template_render_document():
+    template = Template(
+        "<!DOCTYPE html><html><head><title data-slot='title'></title></head></html>"
+    )
+
+    html = template.render(title="Dormouse")
+
+    assert str(html) == (
+        "<!DOCTYPE html><html><head><title>Dormouse</title></head><body></body></html>"
+    )
+
+
+def test_template_render_unknown_slot():
+    template = Template(CARD)
+
+    with pytest.raises(KeyError):
+        template.render(missing="Elsie")
+
+
+def test_template_from_html():
+    html = HTML(CARD)
+    template = Template(html)
+
+    template.render(title="Elsie")
+
+    assert 'data-slot="title"' in str(html)
+
+
+def test_template_render_template_element():
+    template = Template(
+        '<ul><template x-for="item in items"><li x-text="item"></li></template>'
+        '<li data-slot="empty">Empty</li></ul>'
+    )
+
+    html = template.render(empty="Nothing")
+
+    assert str(html) == (
+        '<ul><template x-for="item in items"><li x-text="item"></li></template>'
+        "<li>Nothing</li></ul>"
+    )
+
+
+def test_template_render_text_replaces_children():
+    template = Template('<p data-slot="body">Elsie <b>and</b> <i>Lacie</i></p>')
+
+    assert str(template.render(body="Tillie")) == "<p>Tillie</p>"
+
+
+def test_template_render_nested_slots():
+    template = Template('<div data-slot="a"><span data-slot="b">x</span></div>')
+
+    assert str(template.render(a="x", b="y")) == "<div>x</div>"
+    assert str(template.render(b="y", a="x")) == "<div>x</div>"
+    assert (
+        str(template.render(a={"id": "a"}, b="y")) == '<div id="a"><span>y</span></div>'
+    )
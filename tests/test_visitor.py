@@ -0,0 +1,183 @@
+import pytest
+
+from minestrone import HTML, Element, NodeView, visit
+
+DOCUMENT = """<html><head><title>Dormouse</title></head><body>
+<!-- sisters -->
+<a href="/elsie" class="sister">Elsie</a>
+<a href="/lacie">Lacie</a>
+</body></html>"""
+
+
+def test_visit_tag():
+    hrefs = []
+
+    visit(HTML(DOCUMENT), {"a": lambda view: hrefs.append(view.get("href"))})
+
+    assert hrefs == ["/elsie", "/lacie"]
+
+
+def test_visit_tag_case_insensitive():
+    tags = []
+
+    visit(HTML(DOCUMENT), {"A": lambda view: tags.append(view.tag)})
+
+    assert tags == ["a", "a"]
+
+
+def test_visit_elements():
+    tags = []
+
+    visit(HTML(DOCUMENT), {"*": lambda view: tags.append(view.tag)})
+
+    assert tags == ["html", "head", "title", "body", "a", "a"]
+
+
+def test_visit_elements_before_tag():
+    calls = []
+
+    visit(
+        HTML("<p>Elsie</p>"),
+        {
+            "p": lambda view: calls.append("p"),
+            "*": lambda view: calls.append("*"),
+        },
+    )
+
+    assert calls == ["*", "p"]
+
+
+def test_visit_fragment():
+    tags = []
+
+    visit(HTML("<p>Elsie</p><hr>"), {"*": lambda view: tags.append(view.tag)})
+
+    assert tags == ["p", "hr"]
+
+
+def test_visit_text():
+    texts = []
+
+    visit(
+        HTML("<p>Elsie <b>and</b> Lacie</p>"),
+        {"#text": lambda view: texts.append((view.kind, view.tag, view.text))},
+    )
+
+    assert texts == [
+        ("text", None, "Elsie "),
+        ("text", None, "and"),
+        ("text", None, " Lacie"),
+    ]
+
+
+def test_visit_comment():
+    comments = []
+
+    visit(
+        HTML(DOCUMENT),
+        {"#comment": lambda view: comments.append((view.kind, view.text))},
+    )
+
+    assert comments == [("comment", "sisters")]
+
+
+def test_visit_view():
+    views = []
+
+    def _handler(view):
+        assert isinstance(view, NodeView)
+
+        views.append(
+            (view.kind, view.tag, dict(view.attrs), view.get("id", "none"), view.text)
+        )
+
+    visit(HTML(DOCUMENT), {"a": _handler})
+
+    assert views == [
+        ("element", "a", {"href": "/elsie", "class": "sister"}, "none", "Elsie"),
+        ("element", "a", {"href": "/lacie"}, "none", "Lacie"),
+    ]
+
+
+def test_visit_set_attribute():
+    html = HTML('<p id="a">Hi</p>')
+    index = html.index()
+
+    assert index.get_by_id("a") is not None
+
+    visit(html, {"p": lambda view: view.attrs.__setitem__("id", "b")})
+
+    assert str(html) == '<p id="b">Hi</p>'
+    assert index.get_by_id("a") is None
+    assert index.get_by_id("b").name == "p"
+
+
+def test_visit_svg_tags():
+    tags = []
+    html = HTML(
+        '<svg><clipPath id="c"></clipPath><linearGradient></linearGradient></svg>'
+    )
+
+    visit(html, {"clipPath": lambda view: tags.append(view.tag)})
+    visit(html, {"lineargradient": lambda view: tags.append(view.tag)})
+
+    assert tags == ["clipPath", "linearGradient"]
+
+
+def test_visit_element():
+    html = HTML(DOCUMENT, cache_elements=True)
+    elements = []
+
+    visit(html, {"a": lambda view: elements.append(view.element)})
+
+    assert all(isinstance(element, Element) for element in elements)
+    assert elements == html.query_to_list("a")
+    assert elements[0] is html.query_first("a")
+
+
+def test_visit_element_text():
+    elements = []
+
+    visit(HTML("<p>Elsie</p>"), {"#text": lambda view: elements.append(view.element)})
+
+    assert elements == [None]
+
+
+def test_visit_change_element():
+    html = HTML("<p>Elsie</p>")
+
+    visit(html, {"p": lambda view: view.element.update_attributes(klass="sister")})
+
+    assert str(html) == '<p class="sister">Elsie</p>'
+
+
+def test_visit_subtree():
+    html = HTML(DOCUMENT)
+    tags = []
+
+    visit(html.query_first("head"), {"*": lambda view: tags.append(view.tag)})
+
+    assert tags == ["head", "title"]
+
+
+def test_visit_unknown_kind():
+    with pytest.raises(ValueError):
+        visit(HTML(DOCUMENT), {"#cdata": lambda view: None})
+
+
+def test_visit_empty():
+    visit(HTML(""), {"*": lambda view: pytest.fail("No elements")})
+
+
+def test_visit_comment_outside_html():
+    comments = []
+
+    visit(
+        HTML("<!doctype html><!-- before --><html><body></body></html><!-- after -->"),
+        {
+            "#comment": lambda view: comments.append(view.text),
+            "*": lambda view: comments.append(view.tag),
+        },
+    )
+
+    assert comments == ["before", "html", "head", "body", "after"]